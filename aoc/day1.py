@@ -1,16 +1,58 @@
+import heapq
+import os
+
+
 def get_calories(elf):
     food = elf.split("\n")
     return sum(map(int, food))
 
 
+def read_lines(source):
+    """Lines of a file path, an open (text or binary) file or any iterable of lines"""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source) as f:
+            yield from f
+    else:
+        yield from source
+
+
+def stream_calories(source):
+    """Yields the calories carried by each elf, reading one line at a time"""
+    total = None
+    for line in read_lines(source):
+        line = line.strip()
+        if line:
+            total = int(line) if total is None else total + int(line)
+        elif total is not None:
+            yield total
+            total = None
+    if total is not None:
+        yield total
+
+
+def get_top_k_calories(source, k=3):
+    """k largest totals in descending order, O(k) memory and O(n log k) time"""
+    return heapq.nlargest(k, stream_calories(source))
+
+
 def get_max_calories(fp):
-    inp = open(fp).read().split("\n\n")
-    return max(map(get_calories, inp))
+    return max(stream_calories(fp))
+
+
+def get_sum_top_k_calories(fp, k=3):
+    return sum(get_top_k_calories(fp, k))
 
 
 def get_sum_top_3_calories(fp):
-    inp = open(fp).read().split("\n\n")
-    return sum(list(reversed(sorted(map(get_calories, inp))))[:3])
+    return get_sum_top_k_calories(fp, k=3)
+
+
+def solve_part1(fp):
+    return get_max_calories(fp)
+
+
+def solve_part2(fp):
+    return get_sum_top_3_calories(fp)
 
 
 if __name__ == "__main__":
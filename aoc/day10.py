@@ -1,51 +1,181 @@
+import operator
+from bisect import bisect_right
+
+import numpy as np
+
+
 class CPU:
 
     NOOP_CYCLES = 1
     ADDX_CYCLES = 2
+    CRT_WIDTH = 40
+
+    # instruction name -> (cycles, effect(x, operand) -> new x); None keeps x
+    INSTRUCTIONS = {
+        "noop": (NOOP_CYCLES, None),
+        "addx": (ADDX_CYCLES, operator.add),
+    }
 
-    def __init__(self):
-        # X contains history of all values AFTER the cycle has happened!
-        self.X = [1]
+    def __init__(self, x=1):
+        # X is stored as breakpoints: it holds values[i] AFTER cycle
+        # change_cycles[i] has happened, until the next breakpoint
+        self.change_cycles = [0]
+        self.values = [x]
+        self.cycle = 0
+
+    @classmethod
+    def register_instruction(cls, name, cycles, effect=None):
+        """Adds (or replaces) an instruction for programs compiled afterwards"""
+        cls.INSTRUCTIONS[name] = (cycles, effect)
+
+    def set_x(self, x):
+        if x != self.values[-1]:
+            self.change_cycles.append(self.cycle)
+            self.values.append(x)
+
+    def execute(self, name, operand=0):
+        cycles, effect = CPU.INSTRUCTIONS[name]
+        self.cycle += cycles
+        if effect is not None:
+            self.set_x(effect(self.values[-1], operand))
 
     def noop(self):
-        self.X.extend(CPU.NOOP_CYCLES * [self.X[-1]])
+        self.execute("noop")
 
     def addx(self, v):
-        self.X.extend((CPU.ADDX_CYCLES - 1) * [self.X[-1]])
-        self.X.append(self.X[-1] + v)
+        self.execute("addx", v)
 
     def run_command(self, command):
         match command.rstrip().split():
-            case ["noop"]:
-                self.noop()
-            case ["addx", v]:
-                self.addx(int(v))
+            case [name]:
+                self.execute(name)
+            case [name, v]:
+                self.execute(name, int(v))
+
+    def run(self, program):
+        """Executes a compiled Program, continuing from the current state"""
+        costs = [cycles for cycles, _ in program.instructions]
+        effects = [effect for _, effect in program.instructions]
+        if all(effect in (None, operator.add) for effect in effects):
+            return self._run_additive(program, costs, effects)
+
+        change_cycles, values = self.change_cycles, self.values
+        cycle, x = self.cycle, values[-1]
+        for opcode, operand in zip(program.opcodes.tolist(), program.operands.tolist()):
+            cycle += costs[opcode]
+            if (effect := effects[opcode]) is not None:
+                new_x = effect(x, operand)
+                if new_x != x:
+                    change_cycles.append(cycle)
+                    values.append(new_x)
+                    x = new_x
+        self.cycle = cycle
+        return self
+
+    def _run_additive(self, program, costs, effects):
+        """Whole-array run for programs that only ever add to X"""
+        adds = np.array([effect is operator.add for effect in effects], dtype=bool)
+        cycles = self.cycle + np.cumsum(np.asarray(costs)[program.opcodes])
+        deltas = np.where(adds[program.opcodes], program.operands, 0)
+        changes = deltas != 0
+        self.change_cycles.extend(cycles[changes].tolist())
+        self.values.extend((self.values[-1] + np.cumsum(deltas[changes])).tolist())
+        if len(cycles):
+            self.cycle = int(cycles[-1])
+        return self
+
+    def value_after(self, cycle):
+        """X after cycle has happened (cycle 0 being the initial value)"""
+        return self.values[bisect_right(self.change_cycles, cycle) - 1]
+
+    def values_after(self, cycles):
+        """value_after for an array of cycles at once"""
+        idx = np.searchsorted(self.change_cycles, cycles, side="right") - 1
+        return np.asarray(self.values)[idx]
+
+    @property
+    def X(self):
+        """History of all values AFTER each cycle, expanded (O(cycles) memory)"""
+        return self.values_after(np.arange(self.cycle + 1)).tolist()
 
     def signal_strength(self, cycle):
         """Calculates signal strength DURING cycle"""
-        return self.X[cycle - 1] * cycle
+        return self.value_after(cycle - 1) * cycle
+
+    def signal_strengths(self, cycles):
+        cycles = np.asarray(cycles)
+        return self.values_after(cycles - 1) * cycles
 
     def draw_crt(self):
-        crt_drawing = ""
-        # iterate over cycles
-        for cycle in range(1, len(self.X)):
-            x = self.X[cycle - 1]
-            sprite_pos = [x - 1, x, x + 1]
-            crt_drawing += "#" if (cycle - 1) % 40 in sprite_pos else "."
-            if cycle % 40 == 0:
-                crt_drawing += "\n"
-        return crt_drawing
+        # X during every cycle, one run per breakpoint
+        run_lengths = np.diff(self.change_cycles + [self.cycle]).clip(0)
+        x = np.repeat(self.values, run_lengths)[: self.cycle]
+        pixels = np.arange(self.cycle)
+        lit = np.abs(pixels % CPU.CRT_WIDTH - x) <= 1
+
+        # every full row of the screen ends with a newline
+        n_rows = self.cycle // CPU.CRT_WIDTH
+        drawing = np.full(self.cycle + n_rows, ord("."), dtype=np.uint8)
+        positions = pixels + pixels // CPU.CRT_WIDTH
+        drawing[positions[lit]] = ord("#")
+        drawing[np.arange(1, n_rows + 1) * (CPU.CRT_WIDTH + 1) - 1] = ord("\n")
+        return drawing.tobytes().decode()
 
     def __str__(self):
         return str(self.X)
 
 
-def simulation(fp):
-    commands = open(fp).readlines()
-    cpu = CPU()
+class Program:
+    """Program text compiled once into opcode and operand arrays"""
 
-    for command in commands:
-        cpu.run_command(command)
+    def __init__(self, opcodes, operands, instructions):
+        self.opcodes = opcodes
+        self.operands = operands
+        # opcode -> (cycles, effect), fixed at compile time
+        self.instructions = instructions
+
+    def __len__(self):
+        return len(self.opcodes)
+
+
+def compile_program(text, instructions=None):
+    instructions = CPU.INSTRUCTIONS if instructions is None else instructions
+    names = list(instructions)
+    opcode_of = {name: opcode for opcode, name in enumerate(names)}
+
+    opcodes, operands = [], []
+    for line in text.splitlines():
+        match line.split():
+            case []:
+                continue
+            case [name]:
+                operand = 0
+            case [name, v]:
+                operand = int(v)
+            case _:
+                raise ValueError(f"Cannot parse instruction {line!r}")
+        if name not in opcode_of:
+            raise ValueError(f"Unknown instruction {name!r}")
+        opcodes.append(opcode_of[name])
+        operands.append(operand)
+
+    return Program(
+        np.array(opcodes, dtype=np.min_scalar_type(len(names))),
+        np.array(operands, dtype=np.int64),
+        [instructions[name] for name in names],
+    )
+
+
+def compile_file(fp, instructions=None):
+    return compile_program(open(fp).read(), instructions)
+
+
+def run_program(fp, x=1):
+    return CPU(x).run(compile_file(fp))
+
+
+def simulation(fp):
+    cpu = run_program(fp)
 
     requested_cycles = range(20, 221, 40)
     print(cpu.draw_crt())
@@ -53,6 +183,14 @@ def simulation(fp):
     return sum(map(cpu.signal_strength, requested_cycles))
 
 
+def solve_part1(fp):
+    return simulation(fp)
+
+
+def solve_part2(fp):
+    return run_program(fp).draw_crt()
+
+
 if __name__ == "__main__":
     print(simulation("../tests/10a.txt"))
     # print(simulation("../input/10.txt"))
@@ -1,10 +1,69 @@
+import math
 import re
 from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 import logging
 import numpy as np
-from tqdm import tqdm
+
+# below this many items numpy call overhead outweighs following items one by one
+MIN_VECTORIZED_ITEMS = 256
+# share of the rounds spent looking for an item's cycle before playing it out
+CYCLE_SEARCH_SHARE = 4
 
 RE_START_ITEMS = re.compile(r"Starting items: ((?:\d+,\s)+)")
+RE_OPERATION = re.compile(r"old ([+*]) (\w+)")
+
+
+class Operation:
+    """new = old <op> operand, an operand of None standing for old
+
+    Constants are folded when the operation is built: old + old becomes
+    old * 2 and old * 1 becomes old + 0. Works on ints and numpy arrays alike.
+    """
+
+    def __init__(self, op, operand=None):
+        if op not in ("+", "*"):
+            raise ValueError(f"Unsupported operator {op!r}")
+        if op == "+" and operand is None:
+            op, operand = "*", 2
+        elif op == "*" and operand == 1:
+            op, operand = "+", 0
+        self.op = op
+        self.operand = operand
+
+    @classmethod
+    def parse(cls, text):
+        op, value = RE_OPERATION.search(text).groups()
+        return cls(op, None if value == "old" else int(value))
+
+    @property
+    def coefficients(self):
+        """(a, b, c) such that new = a * old**2 + b * old + c"""
+        if self.operand is None:
+            return 1, 0, 0
+        if self.op == "*":
+            return 0, self.operand, 0
+        return 0, 1, self.operand
+
+    @property
+    def is_identity(self):
+        return self.coefficients == (0, 1, 0)
+
+    def __call__(self, old):
+        if self.op == "*":
+            return old * (old if self.operand is None else self.operand)
+        return old + self.operand
+
+    def __eq__(self, other):
+        return isinstance(other, Operation) and self.coefficients == other.coefficients
+
+    def __hash__(self):
+        return hash(self.coefficients)
+
+    def __repr__(self):
+        operand = "old" if self.operand is None else self.operand
+        return f"new = old {self.op} {operand}"
 
 
 class Monkey:
@@ -21,8 +80,8 @@ class Monkey:
     def update(self, test_result, friend):
         self.friends[test_result] = friend
 
-    def throw_item(self, ring=None):
-        item = self.items.popleft()
+    def inspect(self, item, ring=None):
+        """New worry level of item and the monkey it is thrown to"""
         if ring and self.worry_level == 1:
             # performance optimisation with modulo
             item = self.operation(item) % ring
@@ -32,6 +91,9 @@ class Monkey:
         friend = self.friends[not bool(item % self.test)]
         return item, friend
 
+    def throw_item(self, ring=None):
+        return self.inspect(self.items.popleft(), ring)
+
     def check_throw(self):
         return len(self.items) > 0
 
@@ -40,16 +102,7 @@ class Monkey:
 
     @classmethod
     def parse_operation_string(cls, op):
-        op = op.strip()
-        operation, value = re.search(r"old ([+*]) (\w+)", op).groups()
-        if value == "old":
-            return (lambda x: x * x) if operation == "*" else (lambda x: x + x)
-        else:
-            return (
-                (lambda x: x * int(value))
-                if operation == "*"
-                else (lambda x: x + int(value))
-            )
+        return Operation.parse(op.strip())
 
     @classmethod
     def from_string(cls, text, worry_level=3):
@@ -90,7 +143,7 @@ class MonkeyManager:
         self.inspections = {idx: 0 for idx, monkey in enumerate(self.monkeys)}
         self.ring = None
         if ring:
-            self.ring = np.prod(np.unique([monkey.test for monkey in self.monkeys]))
+            self.ring = math.prod({monkey.test for monkey in self.monkeys})
 
     def play_turn(self, monkey_id):
         monkey = self.monkeys[monkey_id]
@@ -105,29 +158,253 @@ class MonkeyManager:
             self.play_turn(idx)
 
     def monkey_business(self):
-        return np.prod(sorted(self.inspections.values())[-2:])
+        return math.prod(sorted(self.inspections.values())[-2:])
+
+    def take_items(self):
+        """Removes all items, returning monkey ids and worry levels"""
+        monkey_ids, items = [], []
+        for idx, monkey in enumerate(self.monkeys):
+            monkey_ids.extend(len(monkey.items) * [idx])
+            items.extend(monkey.items)
+            monkey.items.clear()
+        return monkey_ids, items
+
+    def give_items(self, monkey_ids, items):
+        for idx, item in zip(monkey_ids, items):
+            self.monkeys[idx].receive_item(item)
+
+    def has_finite_states(self):
+        """Whether worry levels are kept modulo the ring"""
+        return self.ring is not None and all(
+            monkey.worry_level == 1 for monkey in self.monkeys
+        )
+
+    def vectorizable(self, items=()):
+        """Whether every operation stays within int64 under the ring"""
+        if not self.has_finite_states():
+            return False
+        # operations are non-decreasing for non-negative worry levels
+        largest = max([self.ring - 1, *items])
+        return all(monkey.operation(largest) < 2**63 for monkey in self.monkeys)
+
+    def play_item(self, monkey_id, item, n_rounds):
+        """Follows a single item for n_rounds
+
+        Items never interact, so an item's path only depends on its own worry
+        level. Within a round it keeps going while it is thrown to monkeys
+        that have not had their turn yet.
+        """
+        inspections = len(self.monkeys) * [0]
+        inspect = [monkey.inspect for monkey in self.monkeys]
+        ring = self.ring
+        for _ in range(n_rounds):
+            while True:
+                inspections[monkey_id] += 1
+                item, friend = inspect[monkey_id](item, ring)
+                is_next_round = friend <= monkey_id
+                monkey_id = friend
+                if is_next_round:
+                    break
+        return inspections, monkey_id, item
+
+    def play_item_cycles(self, monkey_id, item, n_rounds, max_search=None):
+        """play_item for any n_rounds, extrapolating the item's cycle
+
+        Under the ring an item's state at the start of a round (monkey id,
+        worry level) takes finitely many values, so its rounds eventually
+        repeat. Rounds are simulated until a state recurs, which takes time
+        proportional to the cycle rather than to n_rounds. The search gives
+        up after max_search rounds; the number of rounds actually played is
+        returned last, so the caller can play the rest some other way.
+        """
+        max_search = n_rounds if max_search is None else min(max_search, n_rounds)
+        inspect = [monkey.inspect for monkey in self.monkeys]
+        ring = self.ring
+        first_seen = {}
+        # state at the start of every round and the monkeys inspecting during it
+        states, paths = [], []
+        state = (monkey_id, item)
+        while len(paths) < max_search and state not in first_seen:
+            first_seen[state] = len(states)
+            states.append(state)
+            path = []
+            while True:
+                path.append(monkey_id)
+                item, friend = inspect[monkey_id](item, ring)
+                is_next_round = friend <= monkey_id
+                monkey_id = friend
+                if is_next_round:
+                    break
+            paths.append(path)
+            state = (monkey_id, item)
+
+        inspections = len(self.monkeys) * [0]
+
+        def count(rounds, times=1):
+            for path in rounds:
+                for idx in path:
+                    inspections[idx] += times
+
+        if state not in first_seen:
+            count(paths)
+            return inspections, monkey_id, item, len(paths)
+
+        cycle_start = first_seen[state]
+        n_cycles, rest = divmod(n_rounds - cycle_start, len(paths) - cycle_start)
+        count(paths[:cycle_start])
+        count(paths[cycle_start:], n_cycles)
+        count(paths[cycle_start : cycle_start + rest])
+        monkey_id, item = states[cycle_start + rest]
+        return inspections, monkey_id, item, n_rounds
+
+    def play_items_vectorized(self, monkey_ids, items, n_rounds):
+        """All items at once as int64 arrays
+
+        Every monkey's operation is a row of (a, b, c) coefficients, so one
+        step moves each item still in the round through its current monkey,
+        whichever monkey that is. A round takes as many steps as the longest
+        chain of throws to monkeys that have not had their turn yet.
+        """
+        a, b, c = np.array(
+            [monkey.operation.coefficients for monkey in self.monkeys], dtype=np.int64
+        ).T
+        tests = np.array([monkey.test for monkey in self.monkeys], dtype=np.int64)
+        if_true, if_false = np.array(
+            [(monkey.friends[True], monkey.friends[False]) for monkey in self.monkeys],
+            dtype=np.int64,
+        ).T
+        monkey_ids = np.array(monkey_ids, dtype=np.int64)
+        items = np.array(items, dtype=np.int64)
+        inspections = np.zeros(len(self.monkeys), dtype=np.int64)
+        for _ in range(n_rounds):
+            in_round = np.arange(len(items))
+            while len(in_round):
+                holders = monkey_ids[in_round]
+                worries = items[in_round]
+                inspections += np.bincount(holders, minlength=len(self.monkeys))
+                worries = (
+                    (a[holders] * worries + b[holders]) * worries + c[holders]
+                ) % self.ring
+                friends = np.where(
+                    worries % tests[holders] == 0, if_true[holders], if_false[holders]
+                )
+                items[in_round] = worries
+                monkey_ids[in_round] = friends
+                in_round = in_round[friends > holders]
+        return inspections.tolist(), monkey_ids.tolist(), items.tolist()
+
+    def play_items(self, monkey_ids, items, n_rounds, find_cycles=True):
+        """Inspections per monkey and final item positions after n_rounds
+
+        With find_cycles under the ring, items whose state repeats within the
+        first n_rounds / CYCLE_SEARCH_SHARE rounds are extrapolated; the others
+        carry on from where the search stopped.
+        """
+        if find_cycles and self.has_finite_states():
+            return self.play_items_cycles(monkey_ids, items, n_rounds)
+        if len(items) >= MIN_VECTORIZED_ITEMS and self.vectorizable(items):
+            return self.play_items_vectorized(monkey_ids, items, n_rounds)
+        inspections = len(self.monkeys) * [0]
+        final_ids, final_items = [], []
+        for monkey_id, item in zip(monkey_ids, items):
+            item_inspections, monkey_id, item = self.play_item(
+                monkey_id, item, n_rounds
+            )
+            inspections = [a + b for a, b in zip(inspections, item_inspections)]
+            final_ids.append(monkey_id)
+            final_items.append(item)
+        return inspections, final_ids, final_items
+
+    def play_items_cycles(self, monkey_ids, items, n_rounds):
+        max_search = max(n_rounds // CYCLE_SEARCH_SHARE, 1)
+        inspections = len(self.monkeys) * [0]
+        final_ids, final_items = list(monkey_ids), list(items)
+        unfinished = []
+        for idx, (monkey_id, item) in enumerate(zip(monkey_ids, items)):
+            item_inspections, monkey_id, item, rounds = self.play_item_cycles(
+                monkey_id, item, n_rounds, max_search
+            )
+            inspections = [a + b for a, b in zip(inspections, item_inspections)]
+            final_ids[idx], final_items[idx] = monkey_id, item
+            if rounds < n_rounds:
+                unfinished.append(idx)
+        if unfinished:
+            # all of them gave up after the same number of rounds
+            rest_inspections, rest_ids, rest_items = self.play_items(
+                [final_ids[idx] for idx in unfinished],
+                [final_items[idx] for idx in unfinished],
+                n_rounds - max_search,
+                find_cycles=False,
+            )
+            inspections = [a + b for a, b in zip(inspections, rest_inspections)]
+            for idx, monkey_id, item in zip(unfinished, rest_ids, rest_items):
+                final_ids[idx], final_items[idx] = monkey_id, item
+        return inspections, final_ids, final_items
+
+    def play_rounds(self, n_rounds, processes=None, find_cycles=True):
+        """Plays n_rounds item by item instead of turn by turn
+
+        Under the ring, find_cycles extrapolates every item's cycle so that
+        n_rounds can be arbitrarily large. With processes, the items are split
+        over a process pool.
+        """
+        monkey_ids, items = self.take_items()
+        if processes:
+            chunks = [
+                (monkey_ids[i::processes], items[i::processes])
+                for i in range(processes)
+            ]
+            with ProcessPoolExecutor(processes) as pool:
+                results = list(
+                    pool.map(
+                        play_items_worker,
+                        repeat(self),
+                        *zip(*chunks),
+                        repeat(n_rounds),
+                        repeat(find_cycles),
+                    )
+                )
+        else:
+            results = [self.play_items(monkey_ids, items, n_rounds, find_cycles)]
+
+        for inspections, final_ids, final_items in results:
+            for idx, count in enumerate(inspections):
+                self.inspections[idx] += count
+            self.give_items(final_ids, final_items)
 
     @classmethod
     def from_string(cls, text, ring=None, **kwargs):
         monkey_texts = text.split("\n\n")
         monkeys = [Monkey.from_string(text, **kwargs) for text in monkey_texts]
         return MonkeyManager(monkeys, ring=ring)
-        # for monkey_text in enumerate(monkey_texts):
 
     def __str__(self):
         return "\n".join([str(monkey) for monkey in self.monkeys])
 
 
-def simulation(fp, ring=False, n_rounds=20, worry_level=3):
+def play_items_worker(manager, monkey_ids, items, n_rounds, find_cycles=True):
+    return manager.play_items(monkey_ids, items, n_rounds, find_cycles)
+
+
+def simulation(
+    fp, ring=False, n_rounds=20, worry_level=3, processes=None, find_cycles=True
+):
     text_input = open(fp).read()
     manager = MonkeyManager.from_string(text_input, ring=ring, worry_level=worry_level)
-    for _ in tqdm(range(n_rounds)):
-        manager.play_round()
+    manager.play_rounds(n_rounds, processes=processes, find_cycles=find_cycles)
 
     print(f"\n{manager}")
     return manager.monkey_business()
 
 
+def solve_part1(fp):
+    return simulation(fp)
+
+
+def solve_part2(fp):
+    return simulation(fp, ring=True, worry_level=1, n_rounds=10000)
+
+
 if __name__ == "__main__":
     print(simulation("../tests/11.txt"))
     print(simulation("../tests/11.txt", ring=True, worry_level=1, n_rounds=10000))
@@ -1,97 +1,150 @@
 import numpy as np
-import networkx as nx
-
-
-def read_as_matrix(fp):
-    lines = [l.rstrip() for l in open(fp).readlines()]
-    n_rows = len(lines)
-    n_cols = len(lines[0])
-
-    matrix = np.zeros((n_rows, n_cols))
-    start, end = None, None
-    for r, line in enumerate(lines):
-        for c, character in enumerate(line):
-            if character == "S":
-                matrix[r, c] = 1
-                start = (r, c)
-                continue
-            if character == "E":
-                matrix[r, c] = 26
-                end = (r, c)
-                continue
-            matrix[r, c] = ord(character) - ord("a") + 1
-    return matrix, start, end
-
-
-def get_neigbours(matrix, r, c):
-    n_rows, n_cols = matrix.shape
-    neighbours_indices = [(r, c - 1), (r - 1, c), (r + 1, c), (r, c + 1)]
-    neighbours = [
-        n
-        for n in neighbours_indices
-        if 0 <= n[0] < n_rows
-        and 0 <= n[1] < n_cols
-        and (matrix[n[0], n[1]] - matrix[r, c] <= 1)
-    ]
-    return neighbours
-
-
-def read_hills_as_graph(fp):
-    matrix, start, end = read_as_matrix(fp)
-    n_rows, n_cols = matrix.shape
-
-    G = nx.DiGraph()
-    # add nodes
-    for r in range(n_rows):
-        for c in range(n_cols):
-            G.add_node((r, c))
-    # add edges
-    for r in range(n_rows):
-        for c in range(n_cols):
-            neigbours = get_neigbours(matrix, r, c)
-            for n in neigbours:
-                G.add_edge((r, c), n)
-
-    return G, start, end, matrix
-
-
-def write_path(fp, matrix, path):
-    n_rows, n_cols = matrix.shape
-    grid = [n_cols * ["."] for i in range(n_rows)]
-    for i in range(len(path) - 1):
-        r_from, c_from = path[i][0], path[i][1]
-        r_to, c_to = path[i + 1][0], path[i + 1][1]
-        if r_from > r_to:
-            grid[r_from][c_from] = "v"
-        if r_from < r_to:
-            grid[r_from][c_from] = "^"
-        if c_from < c_to:
-            grid[r_from][c_from] = ">"
-        if c_from > c_to:
-            grid[r_from][c_from] = "<"
-    s = "\n".join(["\t".join(row) for row in grid])
-    with open(fp, "w") as f:
-        f.write(s)
+
+
+def read_heights(fp):
+    """Heights (a=0 ... z=25) as an uint8 grid, with S and E as (row, col)"""
+    data = open(fp, "rb").read().replace(b"\r", b"").strip()
+    width = data.find(b"\n") if b"\n" in data else len(data)
+    grid = np.frombuffer(data + b"\n", dtype=np.uint8).reshape(-1, width + 1)
+    positions = [data.find(mark) for mark in (b"S", b"E")]
+    if -1 in positions:
+        raise ValueError("Height map needs both a start (S) and an end (E)")
+    start, end = (divmod(pos, width + 1) for pos in positions)
+    heights = grid[:, :width] - ord("a")
+    heights[start], heights[end] = 0, 25
+    return heights, start, end
+
+
+def bfs_distances(heights, end, targets=None):
+    """Fewest steps from every cell to end, -1 where end cannot be reached
+
+    A reverse breadth first search from end: a step from u to v is allowed
+    when v is at most one higher than u. Every level is a frontier array of
+    flat indices into a grid padded with already-visited cells, so
+    neighbours need no bounds checks. With a boolean targets grid the search
+    stops after the first level that reaches one of them.
+    """
+    n_rows, n_cols = heights.shape
+    width = n_cols + 2
+    flat_heights = np.zeros((n_rows + 2, width), dtype=np.uint8)
+    flat_heights[1:-1, 1:-1] = heights
+    flat_heights = flat_heights.ravel()
+    distance = np.full((n_rows + 2, width), np.iinfo(np.int32).max, dtype=np.int32)
+    distance[1:-1, 1:-1] = -1
+    flat_distance = distance.ravel()
+    if targets is not None:
+        flat_targets = np.zeros((n_rows + 2, width), dtype=bool)
+        flat_targets[1:-1, 1:-1] = targets
+        flat_targets = flat_targets.ravel()
+
+    frontier = np.array([(end[0] + 1) * width + end[1] + 1])
+    flat_distance[frontier] = 0
+    step = 0
+    while len(frontier) and (targets is None or not flat_targets[frontier].any()):
+        step += 1
+        min_heights = flat_heights[frontier].astype(np.int16) - 1
+        reached = []
+        for offset in (-1, 1, -width, width):
+            neighbours = frontier + offset
+            # one direction never reaches a cell twice; marking it before the
+            # next direction keeps the new frontier free of duplicates
+            new = (flat_distance[neighbours] == -1) & (
+                flat_heights[neighbours] >= min_heights
+            )
+            neighbours = neighbours[new]
+            flat_distance[neighbours] = step
+            reached.append(neighbours)
+        frontier = np.concatenate(reached)
+
+    return distance[1:-1, 1:-1]
+
+
+def closest_distance(distance, cells):
+    """Smallest distance over a boolean grid of cells, -1 if none reaches"""
+    reachable = distance[cells & (distance >= 0)]
+    return int(reachable.min()) if len(reachable) else -1
+
+
+class HeightMap:
+    """Height map parsed once, with reverse BFS distance fields cached per target
+
+    Fields are computed on the first query for a target; every later
+    (start, end) query against the same end is an array lookup.
+    """
+
+    def __init__(self, heights, start=None, end=None):
+        self.heights = heights
+        self.start = start
+        self.end = end
+        self.distance_fields = {}
+
+    @classmethod
+    def from_file(cls, fp):
+        return cls(*read_heights(fp))
+
+    def distances_to(self, end=None):
+        """Fewest steps from every cell to end (-1 where unreachable)"""
+        end = self.end if end is None else tuple(end)
+        if end not in self.distance_fields:
+            self.distance_fields[end] = bfs_distances(self.heights, end)
+        return self.distance_fields[end]
+
+    def distance(self, start=None, end=None):
+        start = self.start if start is None else tuple(start)
+        return int(self.distances_to(end)[start])
+
+    def distances(self, starts, end=None):
+        """Distances from an (n, 2) array of (row, col) starts to end"""
+        rows, cols = np.asarray(starts).T
+        return self.distances_to(end)[rows, cols]
+
+    def distance_from_lowest(self, end=None):
+        """Fewest steps to end from any cell at height a, -1 if none can reach it"""
+        return closest_distance(self.distances_to(end), self.heights == 0)
+
+    def save_distances(self, fp, end=None):
+        np.save(fp, self.distances_to(end))
+
+    def load_distances(self, fp, end=None, mmap_mode="r"):
+        """Caches a field saved by save_distances, memory mapped by default"""
+        end = self.end if end is None else tuple(end)
+        distance = np.load(fp, mmap_mode=mmap_mode)
+        if distance.shape != self.heights.shape:
+            raise ValueError(
+                f"Distance field of shape {distance.shape} does not match "
+                f"height map of shape {self.heights.shape}"
+            )
+        self.distance_fields[end] = distance
+        return distance
 
 
 def simulation_part1(fp):
-    G, start, end, matrix = read_hills_as_graph(fp)
-    shortest_path = nx.shortest_path(G, source=start, target=end)
-    # write_path('G.txt', matrix, shortest_path)
-    return len(shortest_path) - 1
+    heights, start, end = read_heights(fp)
+    targets = np.zeros(heights.shape, dtype=bool)
+    targets[start] = True
+    return int(bfs_distances(heights, end, targets)[start])
 
 
 def simulation_part2(fp):
-    G, start, end, matrix = read_hills_as_graph(fp)
-    shortest_path_dict = nx.shortest_path(G, source=None, target=end)
-    distances = {
-        t: len(shortest_path_dict[t]) - 1
-        for t in shortest_path_dict
-        if matrix[t[0], t[1]] == 1
-    }
-    return min(distances.values())
+    heights, start, end = read_heights(fp)
+    return closest_distance(bfs_distances(heights, end, heights == 0), heights == 0)
+
+
+def simulation(fp):
+    """Both parts from a single parse and a single search"""
+    height_map = HeightMap.from_file(fp)
+    return height_map.distance(), height_map.distance_from_lowest()
+
+
+def solve_part1(fp):
+    return simulation_part1(fp)
+
+
+def solve_part2(fp):
+    return simulation_part2(fp)
 
 
 if __name__ == "__main__":
     print(simulation_part1("../tests/12.txt"))
     print(simulation_part2("../tests/12.txt"))
+    print(simulation("../tests/12.txt"))
@@ -1,102 +1,107 @@
-import ast
-import numpy as np
+import re
+from functools import cmp_to_key
+
+RE_TOKEN = re.compile(r"\d+|.")
+
+
+def parse_packet(text):
+    """Parses a packet such as [1,[2,3]] with a tokenizer for just that grammar
+
+    Raises ValueError on anything else: unknown characters, misplaced commas
+    or brackets, and tokens after the outer list.
+    """
+    stack = []
+    result = None
+    # an element may start at the beginning, after [ and after a comma; a list
+    # may close right after [ or after an element
+    expect_element, can_close = True, False
+    for token in RE_TOKEN.findall(text):
+        if token == "[" and expect_element:
+            stack.append([])
+            expect_element, can_close = True, True
+        elif token == "]" and can_close:
+            packet = stack.pop()
+            if stack:
+                stack[-1].append(packet)
+                expect_element, can_close = False, True
+            else:
+                # outer list closed, nothing may follow
+                result = packet
+                expect_element, can_close = False, False
+        elif token == "," and stack and not expect_element:
+            expect_element, can_close = True, False
+        elif token.isdigit() and stack and expect_element:
+            stack[-1].append(int(token))
+            expect_element, can_close = False, True
+        else:
+            raise ValueError(f"Malformed packet {text!r}")
+    if result is None:
+        raise ValueError(f"Malformed packet {text!r}")
+    return result
 
 
 def read_input(fp):
-    raw_inputs = open(fp).read().split("\n\n")
+    raw_inputs = open(fp).read().strip().split("\n\n")
     pairs_string = map(lambda x: x.split("\n"), raw_inputs)
-    pairs = map(
-        lambda t: (ast.literal_eval(t[0]), ast.literal_eval(t[1])), pairs_string
-    )
+    pairs = map(lambda t: (parse_packet(t[0]), parse_packet(t[1])), pairs_string)
     return pairs
 
 
 def read_packages(fp):
     raw_inputs = open(fp).readlines()
-    packages = [ast.literal_eval(l.rstrip("\n")) for l in raw_inputs if l != "\n"]
+    packages = [parse_packet(l) for l in raw_inputs if l.strip()]
     return packages
 
 
-def compair(left, right):
-    if type(left) != type(right):
-        if type(left) == int:
-            left = [left]
-        elif type(right) == int:
-            right = [right]
-
-    if type(left) == type(right) == int:
-        if left < right:
-            return True
-        elif left > right:
-            return False
-    else:
-        decision = None
-        if len(left) < len(right):
-            decision = True
-        elif len(left) > len(right):
-            decision = False
-        for v1, v2 in zip(left, right):
-            comparison = compair(v1, v2)
-            if comparison is None:
-                continue
-            else:
-                return comparison
-        return decision
-
-
-def merge(s1, s2):
-    merged = []
-    idx_s1 = 0
-    idx_s2 = 0
-    while idx_s1 < len(s1) and idx_s2 < len(s2):
-        if compair(s1[idx_s1], s2[idx_s2]):
-            merged.append(s1[idx_s1])
-            idx_s1 += 1
-        else:
-            merged.append(s2[idx_s2])
-            idx_s2 += 1
-
-    if idx_s1 == len(s1):
-        merged.extend(s2[idx_s2:])
-    elif idx_s2 == len(s2):
-        merged.extend(s1[idx_s1:])
-    return merged
-
-
-def merge_sort_packages(packages):
-    N = len(packages)
-    if N == 1:
-        return packages
-    if N == 2:
-        if compair(packages[0], packages[1]):
-            return [packages[0], packages[1]]
-        else:
-            return [packages[1], packages[0]]
+def compare(left, right):
+    """-1, 0 or 1 as left is in the right order, undecided or in the wrong order"""
+    left_is_int, right_is_int = type(left) is int, type(right) is int
+    if left_is_int and right_is_int:
+        return (left > right) - (left < right)
+    if left_is_int:
+        left = [left]
+    elif right_is_int:
+        right = [right]
+    for v1, v2 in zip(left, right):
+        if comparison := compare(v1, v2):
+            return comparison
+    return (len(left) > len(right)) - (len(left) < len(right))
+
 
-    s1 = merge_sort_packages(packages[: N // 2])
-    s2 = merge_sort_packages(packages[N // 2 :])
-    return merge(s1, s2)
+def compair(left, right):
+    """True, False or None as left is in the right order, in the wrong one or tied"""
+    return {-1: True, 1: False}.get(compare(left, right))
 
 
 def sum_index_sorted(fp):
-    pairs = list(read_input(fp))
-    results = [compair(l, r) for l, r in pairs]
-    s1 = np.sum(np.argwhere(results) + 1)
-    return s1
+    pairs = read_input(fp)
+    return sum(
+        idx for idx, (left, right) in enumerate(pairs, 1) if compare(left, right) < 0
+    )
 
 
 def sort_packages(fp):
-    packages = read_packages(fp)
-    sorted_packages = merge_sort_packages(packages)
-    return sorted_packages
+    return sorted(read_packages(fp), key=cmp_to_key(compare))
 
 
 def get_decoder_key(fp, dividers=[[[2]], [[6]]]):
-    packages = read_packages(fp) + dividers
-    sorted_packages = merge_sort_packages(packages)
-    d1 = sorted_packages.index(dividers[0]) + 1
-    d2 = sorted_packages.index(dividers[1]) + 1
-    return d1 * d2
+    """Product of the divider positions, counting smaller packets instead of sorting"""
+    packages = read_packages(fp)
+    dividers = sorted(dividers, key=cmp_to_key(compare))
+    key = 1
+    for idx, divider in enumerate(dividers):
+        n_smaller = sum(compare(package, divider) < 0 for package in packages)
+        # the earlier dividers come before this one as well
+        key *= n_smaller + idx + 1
+    return key
+
+
+def solve_part1(fp):
+    return sum_index_sorted(fp)
+
+
+def solve_part2(fp):
+    return get_decoder_key(fp)
 
 
 if __name__ == "__main__":
@@ -11,50 +11,140 @@ MAP = {AIR: ".", SAND: "o", ROCK: "#", LEAK: "+"}
 
 
 class Cave:
-    def __init__(self, environment=None, sand_leak=None):
+    """Cave as an int8 grid spanning only the columns sand can reach
+
+    Columns are stored relative to col_offset; coordinates in the API stay
+    absolute. A falling grain lands via a per-column "next solid below" index:
+    every air cell knows the run of solid cells below it (fixed, as sand only
+    settles on top of solid cells), and a union-find over those runs tracks
+    their tops as sand piles up and runs grow into the ones above them.
+    """
+
+    def __init__(self, environment=None, sand_leak=None, col_offset=0):
         self.environment = environment
-        self.environment[sand_leak] = LEAK
+        self.col_offset = col_offset
         self.sand_leak = sand_leak
-        self.abyss_threshold = np.argwhere(self.environment == ROCK)[0, :].max()
+        self.leak = (sand_leak[0], sand_leak[1] - col_offset)
+        self.environment[self.leak] = LEAK
+        self.sand_in_abyss = False
+        # starting points of the falls of the last grain
+        self.path = [self.leak]
+        self.build_solid_index()
+
+    def build_solid_index(self):
+        n_rows, n_cols = self.environment.shape
+        solid = self.environment > AIR
+        rows = np.arange(n_rows)[:, None]
+        cols = np.arange(n_cols)
+        # first solid row at or below every cell (n_rows: none, the abyss)
+        next_solid = np.where(solid, rows, n_rows)[::-1]
+        next_solid = np.minimum.accumulate(next_solid, axis=0)[::-1]
+        # solid runs are named after the flat index of their initial top cell,
+        # runs below the grid after n_rows * n_cols + column
+        run_below = np.where(
+            next_solid < n_rows, next_solid * n_cols + cols, n_rows * n_cols + cols
+        )
+        # top of the run every solid cell belongs to
+        last_air = np.where(solid, -1, rows)
+        run_of_solid = (np.maximum.accumulate(last_air, axis=0) + 1) * n_cols + cols
+        # flat views for scalar access in the grain loop, sharing the grid memory
+        self.cells = memoryview(self.environment).cast("B").cast("b")
+        self.run_below = (
+            memoryview(run_below.astype(np.int64).ravel()).cast("B").cast("q")
+        )
+        self.run_of_solid = (
+            memoryview(run_of_solid.astype(np.int64).ravel()).cast("B").cast("q")
+        )
+        self.run_parent = {}
+        self.run_top_row = {}
+
+    def find_run(self, run):
+        parent = self.run_parent
+        root = run
+        while root in parent:
+            root = parent[root]
+        while run != root:
+            parent[run], run = root, parent[run]
+        return root
+
+    def top_of_run(self, run):
+        n_rows, n_cols = self.environment.shape
+        return self.run_top_row.get(run, min(run // n_cols, n_rows))
+
+    def settle(self, r, c):
+        """Makes (r, c) sand, growing the run below it by one cell"""
+        n_cols = self.environment.shape[1]
+        pos = r * n_cols + c
+        self.cells[pos] = SAND
+        run = self.find_run(self.run_below[pos])
+        self.run_top_row[run] = r
+        if r > 0 and self.cells[pos - n_cols] > AIR:
+            # the run now touches the one above: merge, keeping the upper top
+            self.run_parent[run] = self.find_run(self.run_of_solid[pos - n_cols])
+        if r == self.environment.shape[0] - 1:
+            self.sand_in_abyss = True
 
     def find_next_destination(self, r, c):
-        if r < 0:
-            # abyss
+        """Next position of a grain at (r, c) (local columns)
+
+        The grain falls onto the first solid cell below and then tries to
+        slide diagonally. It is returned unchanged when it is blocked. A
+        grain that falls past every rock lands on the last row, which is
+        what has_sand_in_abyss looks at.
+        """
+        n_rows, n_cols = self.environment.shape
+        cells = self.cells
+        if cells[r * n_cols + c] > AIR:
             return r, c
-        if self.environment[r + 1, c] <= 0:
-            # move down
-            check = np.argwhere(self.environment[r + 1 :, c] > AIR)
-            if len(check) == 0:
-                # we fall in the abyss
-                return -1, c
-            r_new = r + np.argwhere(self.environment[r + 1 :, c] > AIR).min()
+        r_new = self.top_of_run(self.find_run(self.run_below[r * n_cols + c])) - 1
+        if r_new + 1 < n_rows:
+            below = (r_new + 1) * n_cols + c
+            if c > 0 and cells[below - 1] <= AIR:
+                # move diagonally left
+                return r_new + 1, c - 1
+            if c + 1 < n_cols and cells[below + 1] <= AIR:
+                # move diagonally right
+                return r_new + 1, c + 1
+        if r_new != r:
+            # landed on the first solid cell and cannot slide: the next call
+            # returns this position unchanged
             return r_new, c
-        elif self.environment[r + 1, c - 1] <= 0:
-            # move diagonally left
-            return r + 1, c - 1
-        elif self.environment[r + 1, c + 1] <= 0:
-            # move diagonally right
-            return r + 1, c + 1
-        # cannot move further
         return r, c
 
     def has_sand_in_abyss(self):
-        return self.environment[-1, :].sum() > 0
+        return self.sand_in_abyss
 
     def has_filled_leak(self):
-        return self.environment[self.sand_leak] == SAND
+        return self.environment[self.leak] == SAND
 
-    def drop_grain_of_sand(self):
-        # start at the leak
-        r, c = self.sand_leak
+    def drop_grain_of_sand(self, memoize_path=True):
+        """Drops a grain from the leak and returns where it settles
+
+        With memoize_path, the grain starts from the last free position on the
+        previous grain's trajectory: the grid only changed where that grain
+        settled, so both follow the same path up to there. Raises RuntimeError
+        once the leak is blocked, as no grain can fall any more.
+        """
+        n_cols = self.environment.shape[1]
+        path = self.path
+        if not memoize_path:
+            del path[1:]
+        while path and self.cells[path[-1][0] * n_cols + path[-1][1]] > AIR:
+            path.pop()
+        if not path:
+            raise RuntimeError(f"The sand leak at {self.sand_leak} is blocked")
+        r, c = path[-1]
         while True:
             r_new, c_new = self.find_next_destination(r, c)
-            if (r, c) == (r_new, c_new):
+            if (r_new, c_new) == (r, c):
                 # grain is blocked, final destination
                 break
+            if c_new != c:
+                # starting point of the next fall
+                path.append((r_new, c_new))
             r, c = r_new, c_new
-        self.environment[r, c] = SAND
-        return r, c
+        self.settle(r, c)
+        return r, c + self.col_offset
 
     def __str__(self):
         first_column_show = (
@@ -69,6 +159,25 @@ class Cave:
         drawing = "\n".join(["".join(row) for row in environment_array.tolist()])
         return drawing
 
+    def reachable_from_leak(self):
+        """Boolean grid of the cells sand fills before the leak is blocked
+
+        Assumes a floor. A cell fills iff it is not rock and one of the three
+        cells above it fills, so the region comes from one sweep over rows.
+        """
+        rock = self.environment == ROCK
+        filled = np.zeros(self.environment.shape, dtype=bool)
+        row = filled[self.leak[0]]
+        row[self.leak[1]] = True
+        for r in range(self.leak[0] + 1, len(filled)):
+            above = row
+            row = filled[r]
+            row[:] = above
+            row[1:] |= above[:-1]
+            row[:-1] |= above[1:]
+            row &= ~rock[r]
+        return filled
+
     @classmethod
     def draw_line(cls, environment, from_coord, to_coord, value=ROCK):
         if from_coord[0] == to_coord[0]:
@@ -93,33 +202,35 @@ class Cave:
             raise Exception(f"Unexpected input {from_coord, to_coord}")
 
     @classmethod
-    def from_string(cls, string, sand_leak=(0, 500), max_dimension=1000, floor=False):
+    def from_string(cls, string, sand_leak=(0, 500), floor=False):
         rocks = [
             [
                 tuple(map(int, reversed(match.split(","))))
-                for match in re.findall("\d+,\d+", line)
+                for match in re.findall(r"\d+,\d+", line)
             ]
             for line in string.split("\n")
         ]
-        # min_row = min([c[0] for r in rocks for c in r])
-        max_row = max([c[0] for r in rocks for c in r])
-        # min_column = min([c[1] for r in rocks for c in r])
-        max_column = max([c[1] for r in rocks for c in r])
-        n_cols = max(max_column, max_dimension) + 1
+        points = [c for r in rocks for c in r] + [sand_leak]
+        max_row = max(c[0] for c in points)
         n_rows = (
             max_row + 3
         )  # +1 for 0, +1 for under the deepest rock and detect abyss, +1 for floor
+        # sand spreads at most one column per row from the leak, and past the
+        # outermost rocks it can only fall
+        min_col = min(min(c[1] for c in points) - 1, sand_leak[1] - n_rows)
+        max_col = max(max(c[1] for c in points) + 1, sand_leak[1] + n_rows)
 
-        environment = np.zeros((n_rows, n_cols))
+        environment = np.zeros((n_rows, max_col - min_col + 1), dtype=np.int8)
 
         for rock in rocks:
+            rock = [(r, c - min_col) for r, c in rock]
             for idx in range(len(rock) - 1):
                 Cave.draw_line(environment, rock[idx], rock[idx + 1], ROCK)
 
         if floor:
             environment[-1, :] = ROCK
 
-        return Cave(environment=environment, sand_leak=sand_leak)
+        return Cave(environment=environment, sand_leak=sand_leak, col_offset=min_col)
 
 
 def simulation(fp):
@@ -144,6 +255,20 @@ def simulation_part2(fp):
     return it
 
 
+def solve_part1(fp):
+    return simulation(fp)
+
+
+def count_sand_to_fill(fp):
+    """Part 2 without dropping grains, see Cave.reachable_from_leak"""
+    cave = Cave.from_string(open(fp).read(), floor=True)
+    return int(cave.reachable_from_leak().sum())
+
+
+def solve_part2(fp):
+    return count_sand_to_fill(fp)
+
+
 if __name__ == "__main__":
     print(simulation("../tests/14.txt"))
     # print(simulation("../input/14.txt"))
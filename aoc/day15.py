@@ -1,108 +1,174 @@
 import re
-from tqdm import tqdm
+import numpy as np
+
+# rows per coverage_rows call when scanning the whole search square
+ROW_BATCH = 4096
 
 
 def parse_input(fp):
-    raw_input = open(fp).read()
-    numbers = [int(n) for n in re.findall(r"-?\d+", raw_input)]
-    pairs = [
-        (complex(numbers[i], numbers[i + 1]), complex(numbers[i + 2], numbers[i + 3]))
-        for i in range(0, len(numbers), 4)
-    ]
-    return pairs
+    """int64 array with one row (sensor x, sensor y, beacon x, beacon y) per sensor"""
+    numbers = re.findall(r"-?\d+", open(fp).read())
+    return np.array(numbers, dtype=np.int64).reshape(-1, 4)
+
+
+class Sensors:
+    """Sensor positions and radii as int64 arrays, with row coverage queries"""
+
+    def __init__(self, pairs):
+        pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 4)
+        self.x, self.y = pairs[:, 0].copy(), pairs[:, 1].copy()
+        beacon_x, beacon_y = pairs[:, 2], pairs[:, 3]
+        self.radius = np.abs(self.x - beacon_x) + np.abs(self.y - beacon_y)
+        # distinct beacons sorted by row then column, for range lookups
+        order = np.lexsort((beacon_x, beacon_y))
+        beacon_x, beacon_y = beacon_x[order], beacon_y[order]
+        distinct = np.ones(len(order), dtype=bool)
+        distinct[1:] = (beacon_x[1:] != beacon_x[:-1]) | (beacon_y[1:] != beacon_y[:-1])
+        self.beacon_x, self.beacon_y = beacon_x[distinct], beacon_y[distinct]
+
+    @classmethod
+    def from_file(cls, fp):
+        return cls(parse_input(fp))
+
+    def __len__(self):
+        return len(self.x)
+
+    def coverage_rows(self, ys):
+        """Merged x intervals covered by the sensors in each of the rows ys
+
+        Returns (rows, starts, ends): interval i spans starts[i]..ends[i]
+        (inclusive) on row ys[rows[i]]. Intervals are ordered by row then x,
+        and overlapping or touching ones are merged.
+        """
+        ys = np.asarray(ys, dtype=np.int64).reshape(-1)
+        n_sensors = len(self)
+        reach = self.radius - np.abs(ys[:, None] - self.y)
+        active = reach >= 0
+        # sensors out of reach of a row sort last and never start an interval
+        starts = np.where(active, self.x - reach, np.iinfo(np.int64).max)
+        order = np.argsort(starts, axis=1)
+        starts = np.take_along_axis(starts, order, axis=1)
+        ends = np.take_along_axis(self.x + reach, order, axis=1)
+        ends = np.maximum.accumulate(ends, axis=1)
+        new = np.ones(starts.shape, dtype=bool)
+        new[:, 1:] = starts[:, 1:] > ends[:, :-1] + 1
+        new &= np.take_along_axis(active, order, axis=1)
+        first = np.flatnonzero(new)
+        rows = first // n_sensors
+        # an interval ends before the next one starts, or at the last active
+        # sensor of its row
+        last = rows * n_sensors + active.sum(axis=1)[rows] - 1
+        last[:-1] = np.minimum(last[:-1], first[1:] - 1)
+        return rows, starts.reshape(-1)[first], ends.reshape(-1)[last]
+
+    def coverage(self, y):
+        """(starts, ends) of the merged intervals covered on row y"""
+        _, starts, ends = self.coverage_rows([y])
+        return starts, ends
+
+    def count_beacons(self, y, starts, ends):
+        """Number of distinct beacons on row y inside the intervals"""
+        lo, hi = np.searchsorted(self.beacon_y, [y, y + 1])
+        xs = self.beacon_x[lo:hi]
+        inside = np.searchsorted(xs, ends, side="right") - np.searchsorted(xs, starts)
+        return int(inside.sum())
 
 
-def manhattan_distance(a, b):
-    return abs(a.real - b.real) + abs(a.imag - b.imag)
+def count_no_beacons(fp, y):
+    sensors = Sensors.from_file(fp)
+    starts, ends = sensors.coverage(y)
+    return int((ends - starts + 1).sum()) - sensors.count_beacons(y, starts, ends)
+
+
+def find_beacons_brute_force(sensors, min_pos=0, max_pos=20):
+    """First free (x, y) of the search square, scanning rows in batches"""
+    for y0 in range(min_pos, max_pos + 1, ROW_BATCH):
+        ys = np.arange(y0, min(y0 + ROW_BATCH, max_pos + 1))
+        rows, starts, ends = sensors.coverage_rows(ys)
+        inside = (ends >= min_pos) & (starts <= max_pos)
+        rows, starts, ends = rows[inside], starts[inside], ends[inside]
+        # merged intervals leave a gap right after the first one of a row,
+        # unless it reaches past the square
+        first = np.ones(len(rows), dtype=bool)
+        first[1:] = rows[1:] != rows[:-1]
+        free_x = np.full(len(ys), min_pos, dtype=np.int64)
+        free_x[rows[first]] = np.where(
+            starts[first] > min_pos, min_pos, ends[first] + 1
+        )
+        free = np.flatnonzero(free_x <= max_pos)
+        if len(free):
+            return int(free_x[free[0]]), int(ys[free[0]])
+    return None
 
 
-def no_beacons_y(sensor, closest_beacon, y):
-    distance = manhattan_distance(sensor, closest_beacon)
-    y_diff = abs(sensor.imag - y)
-    if y_diff > distance:
+def boundary_candidates(sx, sy, radius, min_pos=0, max_pos=20):
+    """Points where the lines just outside the sensor diamonds cross
+
+    An isolated uncovered point is enclosed by diamond boundaries (lines
+    x + y = a and x - y = b) or by the edges of the search square, so it sits
+    where two of these lines meet.
+    """
+    a = np.concatenate([sx + sy - radius - 1, sx + sy + radius + 1])
+    b = np.concatenate([sx - sy - radius - 1, sx - sy + radius + 1])
+    a = np.sort(a)
+    a = a[np.concatenate([[True], a[1:] != a[:-1]])]
+    b = np.sort(b)
+    b = b[np.concatenate([[True], b[1:] != b[:-1]])]
+    # diagonal against diagonal, keeping only crossings on integer points
+    sums = a[:, None] + b
+    diffs = a[:, None] - b
+    even = sums % 2 == 0
+    xs, ys = [sums[even] // 2], [diffs[even] // 2]
+    # diagonals against the edges of the square, and its corners
+    edges = np.array([min_pos, max_pos], dtype=np.int64)
+    for edge in edges:
+        xs += [np.full(len(a), edge), a - edge, np.full(len(b), edge), b + edge]
+        ys += [a - edge, np.full(len(a), edge), edge - b, np.full(len(b), edge)]
+    xs.append(np.repeat(edges, 2))
+    ys.append(np.tile(edges, 2))
+    xs, ys = np.concatenate(xs), np.concatenate(ys)
+    inside = (xs >= min_pos) & (xs <= max_pos) & (ys >= min_pos) & (ys <= max_pos)
+    return xs[inside], ys[inside]
+
+
+def uncovered(xs, ys, sx, sy, radius):
+    """Points out of reach of every sensor
+
+    Sensors are applied largest first, dropping covered points as it goes, so
+    most candidates are only ever compared to a few sensors.
+    """
+    for i in np.argsort(-radius):
+        keep = np.abs(xs - sx[i]) + np.abs(ys - sy[i]) > radius[i]
+        xs, ys = xs[keep], ys[keep]
+        if not len(xs):
+            break
+    return xs, ys
+
+
+def find_beacon_boundary_intersection(sensors, min_pos=0, max_pos=20):
+    xs, ys = boundary_candidates(sensors.x, sensors.y, sensors.radius, min_pos, max_pos)
+    xs, ys = uncovered(xs, ys, sensors.x, sensors.y, sensors.radius)
+    if not len(xs):
         return None
+    # the puzzle has a single free point; if there are more, take the first
+    # crossing in row-major order (find_beacons_brute_force gives the first
+    # free point of all, which need not be a crossing)
+    idx = np.lexsort((xs, ys))[0]
+    return int(xs[idx]), int(ys[idx])
+
 
-    y_center = complex(sensor.real, y)
-    x_dev = distance - y_diff
-    y_range = (y_center - x_dev, y_center + x_dev)
-    return y_range
-
-
-def merge_intervals(intervals):
-    intervals = sorted(
-        filter(lambda i: i is not None, intervals), key=lambda c: c[0].real
-    )
-    # intervals = map(lambda t: (t[0].real, t[1].real), intervals)
-    merged = []
-    current = intervals[0]
-    for i in range(1, len(intervals)):
-        if (
-            current[1].real >= intervals[i][0].real
-            and intervals[i][1].real >= current[1].real
-        ):
-            # partly overlap detected, change current pointer
-            current = (current[0], intervals[i][1])
-        elif current[1].real < intervals[i][0].real:
-            merged.append(current)
-            current = intervals[i]
-    merged.append(current)
-    return merged
-
-
-def find_n_beacons_in_square(beacons, c1, c2):
-    intersect = set(
-        b
-        for b in beacons
-        if c1.real <= b.real <= c2.real and c2.imag <= b.imag <= c2.imag
-    )
-    return len(intersect)
+def tuning_frequency(fp, min_pos=0, max_pos=20):
+    sensors = Sensors.from_file(fp)
+    x, y = find_beacon_boundary_intersection(sensors, min_pos, max_pos)
+    return 4000000 * x + y
 
 
-def count_no_beacons(fp, y):
-    pairs = parse_input(fp)
-    sensors = [p[0] for p in pairs]
-    beacons = [p[1] for p in pairs]
-    no_beacons_ranges = [no_beacons_y(s, b, y) for s, b in pairs]
-    merged = merge_intervals(no_beacons_ranges)
-    return sum(
-        [
-            manhattan_distance(*interval)
-            + 1
-            - find_n_beacons_in_square(beacons, *interval)
-            for interval in merged
-        ]
-    )
-
-
-def bound_interval(i, xmin=0, xmax=20, ymin=0, ymax=20):
-    return complex(max(xmin, i[0].real), max(ymin, i[0].imag)), complex(
-        min(xmax, i[1].real), min(ymax, i[1].imag)
-    )
-
-
-def find_beacons_brute_force(sensors, beacons, min_pos=0, max_pos=20):
-    for y in tqdm(range(min_pos, max_pos)):
-        intervals = [no_beacons_y(s, b, y) for s, b in zip(sensors, beacons)]
-        # bound intervals to search range
-        intervals = [
-            bound_interval(i, min_pos, max_pos, min_pos, max_pos)
-            for i in intervals
-            if i is not None
-        ]
-        merged = merge_intervals(intervals)
-        if len(merged) > 1:
-            pos = merged[0][1] + 1
-            print(f"FOUND POSITION: {merged} -> {pos}")
-            return pos
-    return None
+def solve_part1(fp, y=10):
+    return count_no_beacons(fp, y=y)
 
 
-def tuning_frequency(fp, min_pos=0, max_pos=20):
-    pairs = parse_input(fp)
-    sensors = [p[0] for p in pairs]
-    beacons = [p[1] for p in pairs]
-    position = find_beacons_brute_force(sensors, beacons, min_pos, max_pos)
-    return 4000000 * position.real + position.imag
+def solve_part2(fp, min_pos=0, max_pos=20):
+    return tuning_frequency(fp, min_pos=min_pos, max_pos=max_pos)
 
 
 if __name__ == "__main__":
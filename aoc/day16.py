@@ -0,0 +1,144 @@
+import re
+import numpy as np
+
+RE_VALVE = re.compile(
+    r"Valve (\w+) has flow rate=(\d+); tunnels? leads? to valves? ([\w, ]+)"
+)
+
+# distance between valves that are not connected
+UNREACHABLE = 10**6
+# the best pressure of every opened set takes 2**n entries
+MAX_FLOW_VALVES = 20
+
+
+def read_valves(fp):
+    """Valve names, flow rates and tunnels (lists of valve names)"""
+    names, flows, tunnels = [], [], []
+    for name, flow, leads in RE_VALVE.findall(open(fp).read()):
+        names.append(name)
+        flows.append(int(flow))
+        tunnels.append(leads.split(", "))
+    return names, flows, tunnels
+
+
+def shortest_distances(names, tunnels):
+    """All pairs tunnel distances (Floyd-Warshall on an int matrix)"""
+    index = {name: i for i, name in enumerate(names)}
+    n = len(names)
+    distances = np.full((n, n), UNREACHABLE, dtype=np.int64)
+    for i, leads in enumerate(tunnels):
+        distances[i, [index[lead] for lead in leads]] = 1
+    np.fill_diagonal(distances, 0)
+    for k in range(n):
+        np.minimum(distances, distances[:, k, None] + distances[k], out=distances)
+    return distances
+
+
+class ValveNetwork:
+    """Tunnels compressed to the valves with flow, plus the starting valve
+
+    distances[i, j] is the number of minutes to walk from valve i to valve
+    j; the start is the last row, so it need not have flow itself.
+    """
+
+    def __init__(self, names, flows, distances):
+        if len(flows) > MAX_FLOW_VALVES:
+            raise ValueError(
+                f"{len(flows)} valves with flow, at most {MAX_FLOW_VALVES} supported"
+            )
+        self.names = names
+        self.flows = flows
+        self.distances = distances
+
+    @classmethod
+    def from_file(cls, fp, start="AA"):
+        names, flows, tunnels = read_valves(fp)
+        distances = shortest_distances(names, tunnels)
+        keep = [i for i, flow in enumerate(flows) if flow > 0]
+        keep.append(names.index(start))
+        return cls(
+            [names[i] for i in keep[:-1]],
+            np.array([flows[i] for i in keep[:-1]], dtype=np.int64),
+            distances[np.ix_(keep, keep)],
+        )
+
+    def best_pressures(self, minutes):
+        """Most pressure released for every set of opened valves
+
+        Returns an array indexed by bitmask of opened valves. A dynamic program
+        over (position, minutes left, opened mask): each state moves to a
+        closed valve and opens it, which releases its flow for the minutes
+        left afterwards. States are int64 keys position << n | mask, collected
+        per minutes left and reduced to the best pressure per key (sort and
+        np.maximum.reduceat) before they expand, all moves at once.
+        """
+        n = len(self.flows)
+        bits = 1 << np.arange(n, dtype=np.int64)
+        # minutes to walk to every valve and open it
+        costs = self.distances[:, :n] + 1
+        best = np.zeros(1 << n, dtype=np.int64)
+        pending = [[] for _ in range(minutes + 1)]
+        pending[minutes].append(
+            (np.array([n << n], dtype=np.int64), np.zeros(1, dtype=np.int64))
+        )
+        for left in range(minutes, 0, -1):
+            if not pending[left]:
+                continue
+            keys = np.concatenate([keys for keys, _ in pending[left]])
+            values = np.concatenate([values for _, values in pending[left]])
+            pending[left] = None
+            order = np.argsort(keys)
+            keys, values = keys[order], values[order]
+            starts = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]]))
+            keys, values = keys[starts], np.maximum.reduceat(values, starts)
+            positions, masks = keys >> n, keys & ((1 << n) - 1)
+            np.maximum.at(best, masks, values)
+
+            # (state, valve) pairs of closed valves that open in time
+            remaining = left - costs[positions]
+            move = ((masks[:, None] & bits) == 0) & (remaining > 0)
+            state, valve = np.nonzero(move)
+            remaining = remaining[state, valve]
+            new_keys = (valve << n) | masks[state] | bits[valve]
+            new_values = values[state] + self.flows[valve] * remaining
+            order = np.argsort(remaining, kind="stable")
+            remaining = remaining[order]
+            splits = np.flatnonzero(remaining[1:] != remaining[:-1]) + 1
+            for start, chunk in zip(
+                np.concatenate([[0], splits]), np.split(order, splits)
+            ):
+                if len(chunk):
+                    pending[remaining[start]].append(
+                        (new_keys[chunk], new_values[chunk])
+                    )
+        return best
+
+    def max_pressure(self, minutes=30):
+        return int(self.best_pressures(minutes).max())
+
+    def max_pressure_together(self, minutes=26):
+        """Most pressure two workers opening disjoint sets of valves release"""
+        n = len(self.flows)
+        best = self.best_pressures(minutes)
+        # best pressure using any subset of each mask
+        within = best.copy()
+        masks = np.arange(1 << n)
+        for valve in range(n):
+            has = (masks >> valve) & 1 == 1
+            within[has] = np.maximum(within[has], within[masks[has] ^ (1 << valve)])
+        return int((best + within[masks ^ ((1 << n) - 1)]).max())
+
+
+def solve_part1(fp):
+    return ValveNetwork.from_file(fp).max_pressure(30)
+
+
+def solve_part2(fp):
+    return ValveNetwork.from_file(fp).max_pressure_together(26)
+
+
+if __name__ == "__main__":
+    print(solve_part1("../tests/16.txt"))
+    # print(solve_part1("../input/16.txt"))
+    print(solve_part2("../tests/16.txt"))
+    # print(solve_part2("../input/16.txt"))
@@ -250,6 +250,14 @@ def simulation(fp, **kwargs):
     return chamber.simulation(move_list, **kwargs)
 
 
+def solve_part1(fp, N=2022):
+    return simulation(fp, N=N)
+
+
+def solve_part2(fp, N=1000000000000):
+    return simulation(fp, N=N, find_repeats=True)
+
+
 if __name__ == "__main__":
     # print(simulation('tests/17.txt', N=2022))
     # print(simulation('input/17.txt', N=2022))
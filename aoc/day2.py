@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def get_score(p1, p2, part2=False):
     # Rock = 0, Paper = 1, Scissors = 2
     p1_tf, p2_tf = ord(p1) - ord("A"), ord(p2) - ord("X")
@@ -13,9 +16,48 @@ def get_score(p1, p2, part2=False):
     return shape_score + result_score
 
 
-def get_total_score(fp, **kwargs):
-    inp = open(fp).readlines()
-    return sum(map(lambda x: get_score(*x.rstrip().split(), **kwargs), inp))
+def build_score_table(part2=False):
+    """Score of every round, indexed by [opponent (A-C), second column (X-Z)]"""
+    return np.array([[get_score(p1, p2, part2) for p2 in "XYZ"] for p1 in "ABC"])
+
+
+SCORE_TABLE = build_score_table()
+SCORE_TABLE_PART2 = build_score_table(part2=True)
+
+
+def count_rounds(data):
+    """3x3 occurrence counts of every (opponent, second column) pair in raw bytes"""
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    # every round is 'P1 P2', so the second column sits 2 bytes after the A/B/C
+    p1_pos = np.flatnonzero((buffer >= ord("A")) & (buffer <= ord("C")))
+    codes = 3 * (buffer[p1_pos] - ord("A")) + (buffer[p1_pos + 2] - ord("X"))
+    return np.bincount(codes, minlength=9).reshape(3, 3)
+
+
+def count_rounds_file(fp, chunk_size=1 << 24):
+    """count_rounds over a file read in chunks that are cut at line ends"""
+    counts = np.zeros((3, 3), dtype=np.int64)
+    remainder = b""
+    with open(fp, "rb") as f:
+        while chunk := f.read(chunk_size):
+            chunk = remainder + chunk
+            cut = chunk.rfind(b"\n") + 1
+            counts += count_rounds(chunk[:cut])
+            remainder = chunk[cut:]
+    return counts + count_rounds(remainder)
+
+
+def get_total_score(fp, part2=False):
+    table = SCORE_TABLE_PART2 if part2 else SCORE_TABLE
+    return int((count_rounds_file(fp) * table).sum())
+
+
+def solve_part1(fp):
+    return get_total_score(fp)
+
+
+def solve_part2(fp):
+    return get_total_score(fp, part2=True)
 
 
 if __name__ == "__main__":
@@ -1,35 +1,91 @@
+from functools import reduce
+from operator import and_, or_
+
+import numpy as np
+
+# every item is one bit of a 52 bit mask: a-z -> bits 0-25, A-Z -> bits 26-51,
+# so the priority of the single item left after intersecting is its bit length
+ITEM_BITS = [0] * 256
+for i in range(26):
+    ITEM_BITS[ord("a") + i] = 1 << i
+    ITEM_BITS[ord("A") + i] = 1 << (26 + i)
+ITEM_BITS_ARRAY = np.array(ITEM_BITS, dtype=np.uint64)
+
+
+def item_mask(items):
+    """Bit mask of the items in a bytes (or str) rucksack"""
+    if isinstance(items, str):
+        items = items.encode()
+    return reduce(or_, map(ITEM_BITS.__getitem__, items), 0)
+
+
+def mask_priority(mask):
+    if mask == 0:
+        raise Exception("Unexpected result")
+    return mask.bit_length()
+
+
 def get_priority(line):
     r1, r2 = line[: len(line) // 2], line[len(line) // 2 :]
-    item = list(set(r1) & set(r2))[0]
-    if item.islower():
-        prio = ord(item) - ord("a") + 1
-    elif item.isupper():
-        prio = ord(item) - ord("A") + 27
-    else:
+    return mask_priority(item_mask(r1) & item_mask(r2))
+
+
+def get_common_elf_priority(*rucksacks):
+    return mask_priority(reduce(and_, map(item_mask, rucksacks)))
+
+
+def read_item_bits(fp):
+    """Item bits of the whole file plus the [start, end) offsets of every rucksack"""
+    buffer = np.frombuffer(open(fp, "rb").read(), dtype=np.uint8)
+    # trailing 0 so that an offset at the very end is still a valid index
+    bits = np.append(ITEM_BITS_ARRAY[buffer], np.uint64(0))
+    newlines = np.flatnonzero(buffer == ord("\n"))
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.concatenate((newlines, [len(buffer)]))
+    # windows line endings
+    ends -= (ends > starts) & (buffer[np.maximum(ends - 1, 0)] == ord("\r"))
+    non_empty = ends > starts
+    return bits, starts[non_empty], ends[non_empty]
+
+
+def segment_masks(bits, *offsets):
+    """OR of bits between consecutive offsets, one row per offset pair"""
+    indices = np.column_stack(offsets).ravel()
+    masks = np.bitwise_or.reduceat(bits, indices)
+    return masks.reshape(-1, len(offsets))[:, :-1]
+
+
+def masks_priority(masks):
+    if np.any(masks == 0):
         raise Exception("Unexpected result")
-    return prio
+    # frexp exponent == bit_length, exact since masks stay below 2**52
+    return int(np.frexp(masks.astype(np.float64))[1].sum())
 
 
 def get_total_priority(fp):
-    inp = open(fp).readlines()
-    return sum(map(lambda x: get_priority(x.rstrip()), inp))
+    bits, starts, ends = read_item_bits(fp)
+    mids = starts + (ends - starts) // 2
+    compartments = segment_masks(bits, starts, mids, ends)
+    return masks_priority(compartments[:, 0] & compartments[:, 1])
 
 
-def get_common_elf_priority(l1, l2, l3):
-    item = list(set(l1) & set(l2) & set(l3))[0]
-    if item.islower():
-        prio = ord(item) - ord("a") + 1
-    elif item.isupper():
-        prio = ord(item) - ord("A") + 27
-    else:
-        raise Exception("Unexpected result")
-    return prio
+def get_total_elf_priority(fp, group_size=3):
+    bits, starts, ends = read_item_bits(fp)
+    rucksacks = segment_masks(bits, starts, ends)[:, 0]
+    if len(rucksacks) % group_size:
+        raise ValueError(
+            f"{len(rucksacks)} rucksacks do not split into groups of {group_size}"
+        )
+    badges = np.bitwise_and.reduce(rucksacks.reshape(-1, group_size), axis=1)
+    return masks_priority(badges)
+
+
+def solve_part1(fp):
+    return get_total_priority(fp)
 
 
-def get_total_elf_priority(fp):
-    inp = open(fp).read().split("\n")
-    inp_per_3 = [inp[i : i + 3] for i in range(0, len(inp), 3)]
-    return sum(map(lambda x: get_common_elf_priority(*x), inp_per_3))
+def solve_part2(fp):
+    return get_total_elf_priority(fp)
 
 
 if __name__ == "__main__":
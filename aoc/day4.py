@@ -1,5 +1,7 @@
 import re
 
+import numpy as np
+
 RE_SECTIONS = re.compile("^(\d+)-(\d+),(\d+)-(\d+)\s*$")
 
 
@@ -13,9 +15,76 @@ def is_overlap(line, full=True):
         return not (s1_max < s2_min or s2_max < s1_min)
 
 
+def parse_numbers(data):
+    """All non-negative integers in a bytes string, parsed with whole-array operations.
+
+    Numbers are located by their first and last digit, then built up Horner style
+    with one vectorised step per digit of the longest number.
+    """
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    is_digit = np.zeros(len(buffer) + 2, dtype=bool)
+    is_digit[1:-1] = (buffer >= ord("0")) & (buffer <= ord("9"))
+    starts = np.flatnonzero(is_digit[1:-1] & ~is_digit[:-2])
+    lengths = np.flatnonzero(is_digit[1:-1] & ~is_digit[2:]) - starts + 1
+
+    numbers = np.zeros(len(starts), dtype=np.int64)
+    for k in range(lengths.max(initial=0)):
+        digits = buffer[np.minimum(starts + k, len(buffer) - 1)] - ord("0")
+        numbers = np.where(lengths > k, 10 * numbers + digits, numbers)
+    return numbers
+
+
+def read_sections(fp):
+    """All assignments of a file as an (n, 4) array of s1_min, s1_max, s2_min, s2_max"""
+    return parse_numbers(open(fp, "rb").read()).reshape(-1, 4)
+
+
+def full_overlaps(sections):
+    s1_min, s1_max, s2_min, s2_max = sections.T
+    return ((s1_min <= s2_min) & (s1_max >= s2_max)) | (
+        (s2_min <= s1_min) & (s2_max >= s1_max)
+    )
+
+
+def partial_overlaps(sections):
+    s1_min, s1_max, s2_min, s2_max = sections.T
+    return ~((s1_max < s2_min) | (s2_max < s1_min))
+
+
 def get_total_number_of_overlaps(fp, full=True):
-    inp = open(fp).readlines()
-    return sum(map(lambda x: is_overlap(x, full), inp))
+    sections = read_sections(fp)
+    overlaps = full_overlaps(sections) if full else partial_overlaps(sections)
+    return int(overlaps.sum())
+
+
+def overlapping_pairs(ranges):
+    """All index pairs (i, j), i < j, of inclusive (min, max) ranges that overlap.
+
+    After sorting on the lower bound, the ranges overlapping range k from the
+    right form one contiguous run: those starting before range k ends. A binary
+    search gives the length of every run, so this is O(n log n + pairs).
+    """
+    ranges = np.asarray(ranges).reshape(-1, 2)
+    order = np.argsort(ranges[:, 0], kind="stable")
+    starts, ends = ranges[order, 0], ranges[order, 1]
+    run_ends = np.searchsorted(starts, ends, side="right")
+    counts = np.maximum(run_ends - np.arange(len(starts)) - 1, 0)
+
+    first = np.repeat(np.arange(len(starts)), counts)
+    # position of every pair within its run: 0, 1, ..., counts[k] - 1
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    second = first + 1 + offsets
+
+    pairs = np.column_stack((order[first], order[second]))
+    return np.sort(pairs, axis=1)
+
+
+def solve_part1(fp):
+    return get_total_number_of_overlaps(fp)
+
+
+def solve_part2(fp):
+    return get_total_number_of_overlaps(fp, full=False)
 
 
 if __name__ == "__main__":
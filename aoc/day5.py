@@ -1,54 +1,66 @@
 import re
-from collections import deque
 
-RE_MOVE_COMMAND = re.compile("^move (\d+) from (\d+) to (\d+)\s*$")
+RE_MOVE_COMMAND = re.compile(r"^move (\d+) from (\d+) to (\d+)\s*$", re.MULTILINE)
 RE_ITEM = re.compile(r"(\s{3, 4}|\[[A-Z]\])")
 
 
+def parse_drawing(drawing):
+    """Stacks as bytearrays (bottom first) from the fixed-width drawing
+
+    Crate labels sit at columns 1, 5, 9, ... so a stride-4 slice of every row
+    gives one level of all stacks at once.
+    """
+    rows = drawing.rstrip("\n").split("\n")
+    n_stacks = len(rows[-1].split())
+    width = 4 * n_stacks
+    levels = [row.ljust(width)[1::4] for row in rows[-2::-1]]
+    return [bytearray("".join(column).rstrip(), "ascii") for column in zip(*levels)]
+
+
 def read_file(fp):
     inp = open(fp).read()
-    stacks_texts = inp.split("\n\n")[0].rstrip("\n").split("\n")
-    commands_texts = inp.split("\n\n")[1].split("\n")
-
-    stack_definition = stacks_texts[-1]
-    n_stacks = int(re.search(r"(\d)+$", stack_definition).group(1))
-
-    stacks = [deque() for _ in range(n_stacks)]
-    for row in stacks_texts[-2::-1]:
-        # items either empty strings or [A-Z]
-        items = [row[i : min(i + 4, len(row))] for i in range(0, len(row), 4)]
-        items = list(map(lambda x: x.rstrip("] ").lstrip("[ "), items))
-        # items = list(map(lambda x: x.rstrip('] ').lstrip('[ '), RE_ITEM.findall(row)))
-        for idx, item in enumerate(items):
-            if item:
-                stacks[idx].append(item)
-
+    drawing, commands_text = inp.split("\n\n", 1)
+    stacks = parse_drawing(drawing)
     commands = [
-        tuple(map(int, RE_MOVE_COMMAND.match(text).groups())) for text in commands_texts
+        tuple(map(int, groups)) for groups in RE_MOVE_COMMAND.findall(commands_text)
     ]
     return stacks, commands
 
 
 def perform_stack_operations(stacks, commands, one_by_one=True):
+    """Move crates in bulk: every command is one slice, one delete and one extend"""
     for amount, from_stack_idx, to_stack_idx in commands:
+        from_stack = stacks[from_stack_idx - 1]
+        if amount > len(from_stack):
+            # same error the old deque.pop() raised on an exhausted stack
+            raise IndexError(
+                f"cannot move {amount} crates from stack {from_stack_idx} "
+                f"holding {len(from_stack)}"
+            )
+        start = len(from_stack) - amount
+        items = from_stack[start:]
+        del from_stack[start:]
         if one_by_one:
-            for _ in range(amount):
-                # if len(stacks[from_stack_idx-1]) > 0:
-                item = stacks[from_stack_idx - 1].pop()
-                stacks[to_stack_idx - 1].append(item)
-        else:
-            items = [stacks[from_stack_idx - 1].pop() for _ in range(amount)]
-            stacks[to_stack_idx - 1].extend(reversed(items))
+            items.reverse()
+        stacks[to_stack_idx - 1] += items
     return stacks
 
 
 def stack_supply(fp, one_by_one=True):
     stacks, commands = read_file(fp)
     stacks = perform_stack_operations(stacks, commands, one_by_one)
-    answer = "".join([s.pop() if len(stacks) > 0 else " " for s in stacks])
+    answer = "".join([chr(s[-1]) if len(s) > 0 else " " for s in stacks])
     return answer
 
 
+def solve_part1(fp):
+    return stack_supply(fp)
+
+
+def solve_part2(fp):
+    return stack_supply(fp, one_by_one=False)
+
+
 # Press the green button in the gutter to run the script.
 if __name__ == "__main__":
     # First star
@@ -1,9 +1,76 @@
+CHUNK_SIZE = 1 << 16
+
+
+class MarkerDetector:
+    """Finds markers (n distinct consecutive characters) in a stream fed in chunks
+
+    Keeps the last position of every byte value, so the start of the current
+    duplicate-free run jumps straight past a repeated character and every byte
+    is looked at once.
+    """
+
+    def __init__(self, n=4):
+        self.n = n
+        self.last_seen = [-1] * 256
+        # number of bytes consumed and start of the current duplicate-free run
+        self.pos = 0
+        self.start = 0
+
+    def feed(self, chunk):
+        """Consumes chunk and returns the end positions of all markers it completes"""
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        n, last_seen, start = self.n, self.last_seen, self.start
+        markers = []
+        for pos, char in enumerate(chunk, self.pos):
+            if last_seen[char] >= start:
+                start = last_seen[char] + 1
+            last_seen[char] = pos
+            if pos - start + 1 >= n:
+                markers.append(pos + 1)
+        self.pos += len(chunk)
+        self.start = start
+        return markers
+
+
+def read_chunks(source, chunk_size=CHUNK_SIZE):
+    """Yields chunks from a str/bytes message, a file-like object or an iterable"""
+    if isinstance(source, (str, bytes, bytearray)):
+        yield source
+    elif hasattr(source, "read"):
+        while chunk := source.read(chunk_size):
+            yield chunk
+    else:
+        yield from source
+
+
+def iter_marker_pos(source, n=4, chunk_size=CHUNK_SIZE):
+    """Yields the end positions of all markers, reading source chunk by chunk"""
+    detector = MarkerDetector(n)
+    for chunk in read_chunks(source, chunk_size):
+        yield from detector.feed(chunk)
+
+
 def find_marker_pos(message, n=4):
-    max_number_checks = len(message) - (n - 1)
-    for i in range(max_number_checks):
-        start_of_package = message[i : i + n]
-        if len(set(start_of_package)) == n:
-            return i + n
+    return next(iter_marker_pos(message, n), None)
+
+
+def find_all_marker_pos(message, n=4):
+    return list(iter_marker_pos(message, n))
+
+
+def find_marker_pos_in_file(fp, n=4, chunk_size=CHUNK_SIZE):
+    """First marker of a datastream file, without loading the whole file"""
+    with open(fp, "rb") as f:
+        return next(iter_marker_pos(f, n, chunk_size), None)
+
+
+def solve_part1(fp):
+    return find_marker_pos_in_file(fp)
+
+
+def solve_part2(fp):
+    return find_marker_pos_in_file(fp, n=14)
 
 
 if __name__ == "__main__":
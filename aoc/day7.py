@@ -1,54 +1,129 @@
 import re
+from bisect import bisect_right
+from itertools import accumulate
 
 RE_FILE_MATCH = re.compile(r"^(\d+)\s(.+)$")
 
 
+class Directory:
+    __slots__ = ("name", "parent", "children", "files", "size")
+
+    def __init__(self, name, parent=None):
+        self.name = name
+        self.parent = parent
+        self.children = {}
+        # file name -> size, so a directory listed twice counts its files once
+        self.files = {}
+        # total size including subdirectories, filled in by rollup_sizes
+        self.size = 0
+
+    def subdirectory(self, name):
+        if name not in self.children:
+            self.children[name] = Directory(name, self)
+        return self.children[name]
+
+    @property
+    def path(self):
+        names = []
+        node = self
+        while node.parent is not None:
+            names.append(node.name)
+            node = node.parent
+        return "/" + "/".join(reversed(names))
+
+    def walk(self):
+        """Directories in pre-order, without recursion"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children.values()))
+
+
+def read_directory_tree(fp):
+    root = Directory("/")
+    current_directory = root
+    with open(fp) as f:
+        for line in f:
+            line = line.rstrip()
+            if line.startswith("$ cd "):
+                name = line[5:]
+                if name == "/":
+                    current_directory = root
+                elif name == "..":
+                    current_directory = current_directory.parent or root
+                else:
+                    current_directory = current_directory.subdirectory(name)
+            elif line.startswith("dir "):
+                current_directory.subdirectory(line[4:])
+            elif mo := RE_FILE_MATCH.match(line):
+                file_size, file_name = mo.groups()
+                current_directory.files[file_name] = int(file_size)
+    rollup_sizes(root)
+    return root
+
+
+def rollup_sizes(root):
+    """Sets every directory's total size in a single post-order pass"""
+    # reversed pre-order visits every child before its parent
+    for node in reversed(list(root.walk())):
+        node.size = sum(node.files.values()) + sum(
+            child.size for child in node.children.values()
+        )
+    return root.size
+
+
 def read_directory_structure(fp):
-    commands = map(lambda l: l.rstrip(), open(fp).readlines())
-    directories = {"/": 0}
-    current_directory = ""
-    for command in commands:
-        if command.startswith("$ cd"):
-            d = command.split()[-1]
-            if d == "/":
-                current_directory = "/"
-            elif d == "..":
-                current_directory = "-".join(current_directory.split("-")[:-1])
-            else:
-                current_directory = f"{current_directory}-{d}"
-            if current_directory not in directories:
-                directories[current_directory] = 0
-        elif command.startswith("$ ls"):
-            continue
-        elif command.startswith("dir"):
-            d = command.split()[-1]
-            listed_directory = f"{current_directory}-{d}"
-            if listed_directory not in directories:
-                directories[listed_directory] = 0
-        elif mo := RE_FILE_MATCH.match(command):
-            file_size, file_name = mo.groups()
-            walk = current_directory.split("-")
-            paths = ["-".join(walk[: i + 1]) for i in range(len(walk))]
-            for path in paths:
-                directories[path] += int(file_size)
-    return directories
+    """Total size of every directory, keyed by its path"""
+    return {node.path: node.size for node in read_directory_tree(fp).walk()}
+
+
+class DirectorySizeIndex:
+    """Sorted directory sizes with prefix sums for threshold queries"""
+
+    def __init__(self, root):
+        self.total_size = root.size
+        self.sizes = sorted(node.size for node in root.walk())
+        self.cumulative_sizes = list(accumulate(self.sizes, initial=0))
+
+    def smallest_above(self, size):
+        """Smallest directory size strictly above size, None if there is none"""
+        idx = bisect_right(self.sizes, size)
+        return self.sizes[idx] if idx < len(self.sizes) else None
+
+    def at_most(self, threshold):
+        """All directory sizes <= threshold, in ascending order"""
+        return self.sizes[: bisect_right(self.sizes, threshold)]
+
+    def sum_at_most(self, threshold):
+        return self.cumulative_sizes[bisect_right(self.sizes, threshold)]
+
+
+def read_size_index(fp):
+    return DirectorySizeIndex(read_directory_tree(fp))
 
 
 def sum_all_directories(fp, threshold=100000):
-    d_fs = read_directory_structure(fp)
-    return sum([d_fs[k] for k in d_fs if d_fs[k] <= threshold])
+    return read_size_index(fp).sum_at_most(threshold)
 
 
 def find_dir_to_delete_size(fp, max_space=70000000, space_required=30000000):
-    d_fs = read_directory_structure(fp)
-    total_size = d_fs["/"]
+    index = read_size_index(fp)
     max_space_for_update = max_space - space_required
-    space_to_delete = total_size - max_space_for_update
+    space_to_delete = index.total_size - max_space_for_update
     if space_to_delete > 0:
-        return min([fs for fs in d_fs.values() if fs > space_to_delete])
+        return index.smallest_above(space_to_delete)
     return
 
 
+def solve_part1(fp):
+    return sum_all_directories(fp)
+
+
+def solve_part2(fp):
+    return find_dir_to_delete_size(fp)
+
+
 if __name__ == "__main__":
     # First star
     print(sum_all_directories("../tests/7.txt"))
@@ -1,59 +1,75 @@
 import numpy as np
-import re
 
 
 def read_field(fp):
-    lines = open(fp).readlines()
-    height = len(lines)
-    width = len(lines[0].strip("\n "))
-    field = np.zeros((height, width))
-
-    for row, line in enumerate(lines):
-        field[row] = re.findall("\d", line)
-
-    return field
-
-
-def get_min_allowed_height(field, r, c):
-    min_left = field[r, :c].max() + 1
-    min_right = field[r, c + 1 :].max() + 1
-    min_top = field[:r, c].max() + 1
-    min_bottom = field[r + 1 :, c].max() + 1
-    return min(min_left, min_right, min_bottom, min_top)
-
-
-def scenic_score(field, r, c):
-    idx_left = np.argwhere(field[r, c - 1 :: -1] >= field[r, c])
-    view_left = idx_left.min() + 1 if len(idx_left) > 0 else c
-
-    idx_right = np.argwhere(field[r, c + 1 :] >= field[r, c])
-    view_right = idx_right.min() + 1 if len(idx_right) > 0 else field.shape[1] - c - 1
-
-    idx_top = np.argwhere(field[r - 1 :: -1, c] >= field[r, c])
-    view_top = idx_top.min() + 1 if len(idx_top) > 0 else r
-
-    idx_bottom = np.argwhere(field[r + 1 :, c] >= field[r, c])
-    view_bottom = (
-        idx_bottom.min() + 1 if len(idx_bottom) > 0 else field.shape[0] - r - 1
-    )
-
-    return view_left * view_right * view_top * view_bottom
+    """Tree heights as an uint8 array, parsed straight from the file bytes"""
+    data = open(fp, "rb").read().replace(b"\r", b"").strip()
+    width = data.find(b"\n") if b"\n" in data else len(data)
+    digits = np.frombuffer(data + b"\n", dtype=np.uint8).reshape(-1, width + 1)
+    return digits[:, :width] - ord("0")
+
+
+def visible_from_top(field):
+    """Trees taller than every tree above them"""
+    tallest_above = np.empty(field.shape, dtype=np.int16)
+    tallest_above[0] = -1
+    np.maximum.accumulate(field[:-1], axis=0, out=tallest_above[1:])
+    return field > tallest_above
+
+
+def viewing_distance_up(field):
+    """Number of trees seen upwards from every tree
+
+    Sweeps the rows top to bottom keeping, for every height, the last row with
+    a tree at least that tall (row 0 being the edge). Heights are single digits,
+    so every row costs one gather and one masked update of a small table.
+    """
+    n_rows, n_cols = field.shape
+    heights = np.arange(field.max() + 1, dtype=field.dtype)[:, None]
+    last_blocking_row = np.zeros((len(heights), n_cols), dtype=np.int32)
+    columns = np.arange(n_cols)
+    distance = np.empty(field.shape, dtype=np.int32)
+    for r, row in enumerate(field):
+        distance[r] = r - last_blocking_row[row, columns]
+        last_blocking_row[heights <= row] = r
+    return distance
+
+
+def in_all_directions(func, field):
+    """func (which looks upwards) applied looking up, down, left and right"""
+    yield func(field)
+    yield func(field[::-1])[::-1]
+    # contiguous rows keep the row-by-row sweeps fast
+    transposed = np.ascontiguousarray(field.T)
+    yield func(transposed).T
+    yield func(transposed[::-1])[::-1].T
+
+
+def visible_trees(field):
+    visible = np.zeros(field.shape, dtype=bool)
+    for visible_from_side in in_all_directions(visible_from_top, field):
+        visible |= visible_from_side
+    return visible
+
+
+def scenic_scores(field):
+    scores = np.ones(field.shape, dtype=np.int64)
+    for distance in in_all_directions(viewing_distance_up, field):
+        scores *= distance
+    return scores
 
 
 def count_visible_trees(fp):
     field = read_field(fp)
-    height, width = field.shape
+    return int(visible_trees(field).sum()), int(scenic_scores(field).max())
+
 
-    min_height = np.zeros(field.shape)
-    scenic_scores = np.zeros(field.shape)
-    for r in range(1, height - 1):
-        for c in range(1, width - 1):
-            min_height[r, c] = get_min_allowed_height(field, r, c)
-            scenic_scores[r, c] = scenic_score(field, r, c)
+def solve_part1(fp):
+    return int(visible_trees(read_field(fp)).sum())
 
-    visible = field >= min_height
 
-    return visible.sum(), scenic_scores.max()
+def solve_part2(fp):
+    return int(scenic_scores(read_field(fp)).max())
 
 
 if __name__ == "__main__":
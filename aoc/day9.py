@@ -1,6 +1,8 @@
 import math
 import re
 
+import numpy as np
+
 RE_COMMAND = re.compile(r"^([RLUD])\s(\d+)\s*$")
 
 
@@ -76,17 +78,191 @@ class Rope:
         return s
 
 
+MOTIONS = {"R": (1, 0), "L": (-1, 0), "U": (0, 1), "D": (0, -1)}
+# knot positions are packed as x * PACK_STRIDE + y, valid while |y| < 2**31
+PACK_STRIDE = 1 << 32
+
+
+def read_commands(fp):
+    """Yields (dx, dy, steps) for every motion, streaming the file"""
+    with open(fp) as f:
+        for line in f:
+            if mo := RE_COMMAND.match(line):
+                direction, steps = mo.groups()
+                yield *MOTIONS[direction], int(steps)
+
+
+def unpack_positions(positions):
+    x = (positions + (1 << 31)) >> 32
+    return x, positions - x * PACK_STRIDE
+
+
+class PackedPositionSet:
+    """Distinct packed positions, kept as a sorted int64 array
+
+    Positions are buffered and merged in batches, so memory stays at about 8
+    bytes per distinct cell rather than a Python set entry per cell. With
+    count_visits the number of times every position was added is kept too.
+    """
+
+    MERGE_SIZE = 1 << 22
+
+    def __init__(self, merge_size=MERGE_SIZE, count_visits=False):
+        self.positions = np.zeros(0, dtype=np.int64)
+        self.visits = np.zeros(0, dtype=np.int64) if count_visits else None
+        self.merge_size = merge_size
+        self.pending = []
+        self.n_pending = 0
+
+    def update(self, positions):
+        positions = np.asarray(positions, dtype=np.int64)
+        self.pending.append(positions)
+        self.n_pending += len(positions)
+        # merging only once the buffer matches the set keeps merges amortized O(1)
+        if self.n_pending >= max(self.merge_size, len(self.positions)):
+            self.merge()
+
+    def add_range(self, start, stop, step):
+        self.update(np.arange(start, stop, step, dtype=np.int64))
+
+    def merge(self):
+        if not self.n_pending:
+            return
+        positions = np.concatenate([self.positions, *self.pending])
+        if self.visits is not None:
+            order = np.argsort(positions)
+            positions = positions[order]
+            visits = np.concatenate([self.visits, np.ones(self.n_pending, np.int64)])
+            visits = visits[order]
+        else:
+            positions.sort()
+        is_new = np.empty(len(positions), dtype=bool)
+        is_new[:1] = True
+        np.not_equal(positions[1:], positions[:-1], out=is_new[1:])
+        if self.visits is not None:
+            self.visits = np.add.reduceat(visits, np.flatnonzero(is_new))
+        self.positions = positions[is_new]
+        self.pending, self.n_pending = [], 0
+
+    def __len__(self):
+        self.merge()
+        return len(self.positions)
+
+
+def track_knots(commands, n_knots=2, count_visits=False, knots=None):
+    """Positions visited by every knot of the rope, in a single simulation
+
+    Knots are plain int coordinates moved by sign arithmetic and the packed
+    position of a tracked knot is recorded whenever it moves. A knot that stays
+    put cannot move the knots behind it, so propagation stops there. Once the
+    rope trails straight behind the head it translates rigidly, so the rest of
+    the motion is applied at once. knots limits tracking to some knot indices,
+    the others get None.
+    """
+    xs, ys = n_knots * [0], n_knots * [0]
+    knots = range(n_knots) if knots is None else knots
+    visited = [
+        PackedPositionSet(count_visits=count_visits) if i in knots else None
+        for i in range(n_knots)
+    ]
+    moved_to = [[0] if i in knots else None for i in range(n_knots)]
+    n_buffered = 0
+    for dx, dy, steps in commands:
+        stride = dx * PACK_STRIDE + dy
+        n_buffered += steps
+        while steps:
+            steps -= 1
+            xs[0] += dx
+            ys[0] += dy
+            if moved_to[0] is not None:
+                moved_to[0].append(xs[0] * PACK_STRIDE + ys[0])
+            for i in range(1, n_knots):
+                delta_x = xs[i - 1] - xs[i]
+                delta_y = ys[i - 1] - ys[i]
+                if -1 <= delta_x <= 1 and -1 <= delta_y <= 1:
+                    break
+                xs[i] += (delta_x > 0) - (delta_x < 0)
+                ys[i] += (delta_y > 0) - (delta_y < 0)
+                if moved_to[i] is not None:
+                    moved_to[i].append(xs[i] * PACK_STRIDE + ys[i])
+            else:
+                if all(
+                    xs[i - 1] - xs[i] == dx and ys[i - 1] - ys[i] == dy
+                    for i in range(1, n_knots)
+                ):
+                    for i in range(n_knots):
+                        if visited[i] is not None:
+                            pos = xs[i] * PACK_STRIDE + ys[i]
+                            end_pos = pos + (steps + 1) * stride
+                            visited[i].add_range(pos + stride, end_pos, stride)
+                        xs[i] += steps * dx
+                        ys[i] += steps * dy
+                    steps = 0
+        if n_buffered >= PackedPositionSet.MERGE_SIZE:
+            flush_positions(visited, moved_to)
+            n_buffered = 0
+    flush_positions(visited, moved_to)
+    return visited
+
+
+def flush_positions(visited, moved_to):
+    for knot_visited, positions in zip(visited, moved_to):
+        if knot_visited is not None:
+            knot_visited.update(positions)
+            positions.clear()
+
+
+def count_knot_positions(commands, n_knots=2, knots=None):
+    """Number of distinct positions of every (tracked) knot, head first"""
+    return [
+        len(knot_visited) if knot_visited is not None else None
+        for knot_visited in track_knots(commands, n_knots, knots=knots)
+    ]
+
+
+def count_tail_positions(commands, n_knots=2):
+    return len(track_knots(commands, n_knots, knots={n_knots - 1})[-1])
+
+
+def visit_heatmaps(visited):
+    """Visit counts of every knot on a shared grid
+
+    visited comes from track_knots(..., count_visits=True). Returns an array
+    indexed [knot, y - min_y, x - min_x] (all zero for untracked knots) and the
+    origin (min_x, min_y).
+    """
+    coordinates = {}
+    for knot, knot_visited in enumerate(visited):
+        if knot_visited is not None:
+            knot_visited.merge()
+            coordinates[knot] = unpack_positions(knot_visited.positions)
+    min_x = min(x.min() for x, _ in coordinates.values())
+    max_x = max(x.max() for x, _ in coordinates.values())
+    min_y = min(y.min() for _, y in coordinates.values())
+    max_y = max(y.max() for _, y in coordinates.values())
+    heatmaps = np.zeros(
+        (len(visited), max_y - min_y + 1, max_x - min_x + 1), dtype=np.int64
+    )
+    for knot, (x, y) in coordinates.items():
+        heatmaps[knot, y - min_y, x - min_x] = visited[knot].visits
+    return heatmaps, (int(min_x), int(min_y))
+
+
 def simulation(fp, rope_length=2):
-    commands = open(fp).readlines()
+    return count_tail_positions(read_commands(fp), rope_length)
+
+
+def simulation_all_knots(fp, rope_length=10, knots=None):
+    """Distinct positions of every knot; knot k is the tail of a (k + 1)-knot rope"""
+    return count_knot_positions(read_commands(fp), rope_length, knots)
+
 
-    state_machine = Rope((0, 0), rope_length)
+def solve_part1(fp):
+    return simulation(fp)
 
-    for command in commands:
-        state_machine.run_command(command)
-        # print(f"\n\n{command}\n{state_machine}")
 
-    n_tail_states = state_machine.nbr_different_tail_states()
-    return n_tail_states
+def solve_part2(fp):
+    return simulation(fp, rope_length=10)
 
 
 if __name__ == "__main__":
@@ -96,5 +272,7 @@ if __name__ == "__main__":
 
     # Second star
     print(simulation("../tests/9.txt", rope_length=10))
+    # Both stars in one pass: knots 1 and 9 of a 10-knot rope
+    print(simulation_all_knots("../tests/9b.txt", knots={1, 9})[1::8])
     print(simulation("../tests/9b.txt", rope_length=10))
     # print(simulation("../input/9.txt", rope_length=10))
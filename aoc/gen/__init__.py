@@ -0,0 +1,36 @@
+"""Seeded generators of (large) puzzle inputs, one module per day.
+
+Every ``aoc.gen.day<N>`` module exposes ``generate(n, seed=0) -> str`` which
+returns the text of an input in the same format as ``tests/<N>.txt``. ``n`` is
+the dimension that drives the day's runtime (number of elves, commands, grid
+width, valves, ...) and ``SIZES`` holds a sensible default sweep for it. A module
+can define ``SOLVER_PARAMS`` when the solvers need keyword arguments that match
+the generated input (e.g. the row and search space of day 15).
+"""
+
+import importlib
+import os
+
+
+def load(day):
+    return importlib.import_module(f"aoc.gen.day{day}")
+
+
+def generate(day, n, seed=0):
+    return load(day).generate(n, seed=seed)
+
+
+def default_sizes(day):
+    return load(day).SIZES
+
+
+def solver_params(day):
+    return dict(getattr(load(day), "SOLVER_PARAMS", dict()))
+
+
+def write_input(day, n, directory, seed=0):
+    """Writes a generated input as <directory>/<day>.txt and returns its path."""
+    fp = os.path.join(directory, f"{day}.txt")
+    with open(fp, "w") as f:
+        f.write(generate(day, n, seed=seed))
+    return fp
@@ -0,0 +1,13 @@
+import numpy as np
+
+SIZES = (10**3, 10**4, 10**5, 10**6)
+
+
+def generate(n, seed=0):
+    """n elves carrying 1 to 15 food items each"""
+    rng = np.random.default_rng(seed)
+    n_items = rng.integers(1, 16, n)
+    calories = rng.integers(1000, 60001, n_items.sum()).astype(str).tolist()
+    ends = np.cumsum(n_items).tolist()
+    starts = [0] + ends[:-1]
+    return "\n\n".join("\n".join(calories[s:e]) for s, e in zip(starts, ends))
@@ -0,0 +1,21 @@
+import random
+
+SIZES = (10**3, 10**4, 10**5, 10**6)
+
+
+def generate(n, seed=0):
+    """program of n instructions, X stays within the 40 pixel wide screen
+
+    At least 146 instructions are generated so that cycle 220 is reached.
+    """
+    rng = random.Random(seed)
+    x = 1
+    lines = []
+    for _ in range(max(n, 146)):
+        if rng.random() < 0.3:
+            lines.append("noop")
+            continue
+        v = rng.randint(-x, 39 - x)
+        x += v
+        lines.append(f"addx {v}")
+    return "\n".join(lines)
@@ -0,0 +1,37 @@
+import random
+
+SIZES = (4, 8, 16, 32)
+
+PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71]
+
+
+def generate(n, seed=0, items_per_monkey=4):
+    """n monkeys (at most 20, each with its own prime test) juggling items
+
+    Nobody throws to the monkey that squares, so only its own starting items
+    are squared, once: without the ring, part 1's worry levels would
+    otherwise grow past what int() and str() convert in 20 rounds.
+    """
+    rng = random.Random(seed)
+    n = min(max(n, 4), len(PRIMES))
+    tests = rng.sample(PRIMES, n)
+    square = rng.randrange(n)
+    monkeys = []
+    for idx in range(n):
+        items = ", ".join(
+            str(rng.randint(50, 99)) for _ in range(rng.randint(1, items_per_monkey))
+        )
+        if idx == square:
+            operation = "old * old"
+        else:
+            operation = f"old {rng.choice('+*')} {rng.randint(1, 9)}"
+        friends = rng.sample([i for i in range(n) if i not in (idx, square)], 2)
+        monkeys.append(
+            f"Monkey {idx}:\n"
+            f"  Starting items: {items}\n"
+            f"  Operation: new = {operation}\n"
+            f"  Test: divisible by {tests[idx]}\n"
+            f"    If true: throw to monkey {friends[0]}\n"
+            f"    If false: throw to monkey {friends[1]}"
+        )
+    return "\n\n".join(monkeys)
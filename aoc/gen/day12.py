@@ -0,0 +1,28 @@
+import random
+
+SIZES = (100, 400, 1000, 2000)
+
+
+def generate(n, seed=0, height=None):
+    """height map n columns wide climbing from a to z from left to right
+
+    Every column is at most one level higher than the previous one (so at least 26
+    columns are needed), cells are randomly lowered to create obstacles except on
+    the row of S and E.
+    """
+    rng = random.Random(seed)
+    n = max(n, 26)
+    height = height or max(n // 4, 3)
+    mid = height // 2
+    rows = []
+    for r in range(height):
+        row = []
+        for c in range(n):
+            level = c * 25 // (n - 1)
+            if r != mid and rng.random() < 0.3:
+                level = rng.randint(0, level)
+            row.append(chr(ord("a") + level))
+        rows.append(row)
+    rows[mid][0] = "S"
+    rows[mid][-1] = "E"
+    return "\n".join("".join(row) for row in rows)
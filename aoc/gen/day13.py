@@ -0,0 +1,19 @@
+import random
+
+SIZES = (10**2, 10**3, 10**4)
+
+
+def packet(rng, depth=0, max_depth=4):
+    items = []
+    for _ in range(rng.randint(0, 5)):
+        if depth < max_depth and rng.random() < 0.3:
+            items.append(packet(rng, depth + 1, max_depth))
+        else:
+            items.append(str(rng.randint(0, 10)))
+    return "[" + ",".join(items) + "]"
+
+
+def generate(n, seed=0):
+    """n pairs of nested packets"""
+    rng = random.Random(seed)
+    return "\n\n".join(f"{packet(rng)}\n{packet(rng)}" for _ in range(n))
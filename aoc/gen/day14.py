@@ -0,0 +1,66 @@
+import random
+
+SIZES = (20, 50, 100, 200)
+
+
+def rock_cells(points):
+    """(x, y) cells covered by a rock path"""
+    cells = set()
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        for x in range(min(x0, x1), max(x0, x1) + 1):
+            for y in range(min(y0, y1), max(y0, y1) + 1):
+                cells.add((x, y))
+    return cells
+
+
+def blocking_path(paths, leak=500):
+    """Index of a path sealing the leak off from the abyss, None if sand gets out
+
+    Sand reaches every cell reachable from the leak by moves down and
+    diagonally down that avoid rock; it falls into the abyss exactly when that
+    region gets below the deepest rock. Rows are swept as int bitmasks.
+    """
+    cells = [rock_cells(points) for points in paths]
+    depth = max(y for path in cells for _, y in path)
+    base = min(leak - depth - 2, min(x for path in cells for x, _ in path) - 1)
+    rows = [0] * (depth + 2)
+    for path in cells:
+        for x, y in path:
+            rows[y] |= 1 << (x - base)
+    reach = 1 << (leak - base)
+    for y in range(1, depth + 2):
+        below = reach | reach << 1 | reach >> 1
+        reach = below & ~rows[y]
+        if not reach:
+            blocked = below & rows[y]
+            for idx, path in enumerate(cells):
+                if any(cy == y and blocked >> (cx - base) & 1 for cx, cy in path):
+                    return idx
+    return None
+
+
+def generate(n, seed=0, n_paths=None):
+    """rock paths in a cave n rows deep and 2n columns wide around the leak at x=500
+
+    Paths that seal the leak off from the abyss are dropped, so part 1 ends.
+    """
+    rng = random.Random(seed)
+    n = max(n, 4)
+    n_paths = n_paths or max(n // 2, 1)
+    paths = []
+    for _ in range(n_paths):
+        x, y = rng.randint(500 - n, 500 + n), rng.randint(2, n)
+        points = [(x, y)]
+        for _ in range(rng.randint(1, 4)):
+            if len(points) % 2:
+                x = min(max(x + rng.randint(-n // 4, n // 4), 500 - n), 500 + n)
+            else:
+                y = min(max(y + rng.randint(-n // 4, n // 4), 2), n)
+            points.append((x, y))
+        paths.append(points)
+    while paths and (idx := blocking_path(paths)) is not None:
+        del paths[idx]
+    if not paths:
+        # a single ledge cannot hold sand
+        paths = [[(500 - n // 4, n), (500 + n // 4, n)]]
+    return "\n".join(" -> ".join(f"{x},{y}" for x, y in points) for points in paths)
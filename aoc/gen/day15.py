@@ -0,0 +1,25 @@
+import random
+
+SIZES = (10, 30, 100, 300)
+
+MAX_POS = 4000
+# keyword arguments of the solvers that match the generated search space
+SOLVER_PARAMS = dict(y=MAX_POS // 2, max_pos=MAX_POS)
+
+
+def generate(n, seed=0, max_pos=MAX_POS):
+    """n sensors in [0, max_pos]^2 none of which covers a hidden distress beacon"""
+    rng = random.Random(seed)
+    hidden = rng.randint(0, max_pos), rng.randint(0, max_pos)
+    lines = []
+    for _ in range(n):
+        sx, sy = rng.randint(0, max_pos), rng.randint(0, max_pos)
+        reach = abs(sx - hidden[0]) + abs(sy - hidden[1]) - 1
+        radius = rng.randint(0, max(reach, 0))
+        dx = rng.randint(-radius, radius)
+        dy = (radius - abs(dx)) * rng.choice([-1, 1])
+        lines.append(
+            f"Sensor at x={sx}, y={sy}: "
+            f"closest beacon is at x={sx + dx}, y={sy + dy}"
+        )
+    return "\n".join(lines)
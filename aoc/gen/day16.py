@@ -0,0 +1,44 @@
+import random
+import string
+from itertools import product
+
+SIZES = (10, 20, 40, 60)
+
+NAMES = ["".join(p) for p in product(string.ascii_uppercase, repeat=2)]
+
+
+def generate(n, seed=0, n_flows=None):
+    """connected tunnel network of n valves (AA included), n_flows of them with flow"""
+    rng = random.Random(seed)
+    n = min(max(n, 2), len(NAMES))
+    n_flows = min(n_flows or max(n // 4, 1), n - 1)
+    names = ["AA"] + rng.sample(NAMES[1:], n - 1)
+    flows = {name: 0 for name in names}
+    for name in rng.sample(names[1:], n_flows):
+        flows[name] = rng.randint(1, 25)
+
+    tunnels = {name: set() for name in names}
+    for i in range(1, n):
+        # random spanning tree to be connected, plus a few shortcuts
+        other = names[rng.randrange(i)]
+        tunnels[names[i]].add(other)
+        tunnels[other].add(names[i])
+    for _ in range(n // 4):
+        a, b = rng.sample(names, 2)
+        tunnels[a].add(b)
+        tunnels[b].add(a)
+
+    lines = []
+    for name in names:
+        leads = sorted(tunnels[name])
+        if len(leads) == 1:
+            lines.append(
+                f"Valve {name} has flow rate={flows[name]}; "
+                f"tunnel leads to valve {leads[0]}"
+            )
+        else:
+            lines.append(
+                f"Valve {name} has flow rate={flows[name]}; "
+                f"tunnels lead to valves {', '.join(leads)}"
+            )
+    return "\n".join(lines)
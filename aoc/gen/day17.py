@@ -0,0 +1,9 @@
+import random
+
+SIZES = (40, 400, 4000)
+
+
+def generate(n, seed=0):
+    """jet pattern of n pushes"""
+    rng = random.Random(seed)
+    return "".join(rng.choices("<>", k=n)) + "\n"
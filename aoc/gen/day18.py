@@ -0,0 +1,13 @@
+import random
+
+SIZES = (10**2, 2 * 10**2, 5 * 10**2)
+
+
+def generate(n, seed=0):
+    """n distinct lava cubes in a box sized to about 30% occupancy"""
+    rng = random.Random(seed)
+    side = max(int(round((n / 0.3) ** (1 / 3))), 2)
+    cubes = set()
+    while len(cubes) < min(n, side**3):
+        cubes.add(tuple(rng.randint(1, side) for _ in range(3)))
+    return "".join(f"{x},{y},{z}\n" for x, y, z in cubes)
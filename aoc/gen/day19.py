@@ -0,0 +1,38 @@
+import random
+
+SIZES = (1, 2, 4, 8)
+
+# (ore robot ore, clay robot ore, obsidian robot ore and clay, geode robot ore
+# and obsidian) in the range of the puzzle inputs. Prices drawn freely from
+# that range can keep the pruned search in day 19 busy for minutes, so only
+# blueprints it solves within a few seconds for 24 and 32 minutes are used.
+PRICES = (
+    (2, 3, 3, 8, 3, 12),
+    (2, 4, 2, 13, 2, 20),
+    (2, 4, 4, 9, 3, 20),
+    (2, 3, 2, 17, 3, 9),
+    (4, 2, 3, 13, 2, 5),
+    (3, 2, 3, 6, 2, 8),
+    (2, 3, 3, 9, 2, 6),
+    (3, 4, 3, 13, 2, 10),
+)
+
+
+def generate(n, seed=0):
+    """n robot blueprints with prices in the range of the puzzle inputs"""
+    rng = random.Random(seed)
+    lines = []
+    for idx in range(1, n + 1):
+        ore, clay, obsidian_ore, obsidian_clay, geode_ore, geode_obsidian = rng.choice(
+            PRICES
+        )
+        lines.append(
+            f"Blueprint {idx}: "
+            f"Each ore robot costs {ore} ore. "
+            f"Each clay robot costs {clay} ore. "
+            f"Each obsidian robot costs {obsidian_ore} ore "
+            f"and {obsidian_clay} clay. "
+            f"Each geode robot costs {geode_ore} ore "
+            f"and {geode_obsidian} obsidian.\n"
+        )
+    return "".join(lines)
@@ -0,0 +1,11 @@
+import numpy as np
+
+SIZES = (10**4, 10**5, 10**6, 10**7)
+
+ROUNDS = np.array([f"{p1} {p2}" for p1 in "ABC" for p2 in "XYZ"])
+
+
+def generate(n, seed=0):
+    """n rounds of rock paper scissors"""
+    rng = np.random.default_rng(seed)
+    return "\n".join(ROUNDS[rng.integers(0, len(ROUNDS), n)].tolist())
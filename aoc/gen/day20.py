@@ -0,0 +1,11 @@
+import random
+
+SIZES = (10**2, 10**3, 5 * 10**3)
+
+
+def generate(n, seed=0):
+    """n encrypted numbers containing exactly one 0"""
+    rng = random.Random(seed)
+    numbers = [rng.choice([-1, 1]) * rng.randint(1, 10000) for _ in range(n - 1)]
+    numbers.insert(rng.randint(0, len(numbers)), 0)
+    return "".join(f"{number}\n" for number in numbers)
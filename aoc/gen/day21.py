@@ -0,0 +1,71 @@
+import random
+from collections import deque
+import string
+from itertools import product
+
+SIZES = (10**2, 10**3, 10**4)
+
+
+def generate(n, seed=0):
+    """about n yelling monkeys forming one expression tree below root
+
+    Values are built top-down so that every number stays positive and every
+    division is exact, humn is a leaf that never ends up in a divisor so part 2
+    stays a linear equation.
+    """
+    rng = random.Random(seed)
+    n = max(n, 3)
+    names = iter(
+        rng.sample(
+            [
+                name
+                for name in map("".join, product(string.ascii_lowercase, repeat=4))
+                if name not in ("root", "humn")
+            ],
+            2 * n + 4,
+        )
+    )
+    jobs = dict()
+    # leaves allowed to become humn
+    candidates = []
+    budget = n
+
+    # breadth first, so the tree stays O(log n) deep for the recursive solver
+    a, b = next(names), next(names)
+    target = rng.randint(1, 1000)
+    jobs["root"] = f"{a} + {b}"
+    queue = deque([(a, target, False), (b, target, True)])
+    while queue:
+        name, value, in_divisor = queue.popleft()
+        budget -= 1
+        if budget <= 0 or rng.random() < 0.2:
+            jobs[name] = str(value)
+            if not in_divisor:
+                candidates.append(name)
+            continue
+        left, right = next(names), next(names)
+        op = rng.choice("+-*/")
+        if op == "+" and value > 1:
+            a = rng.randint(1, value - 1)
+            lhs, rhs = value - a, a
+        elif op == "-":
+            b = rng.randint(1, 100)
+            lhs, rhs = value + b, b
+        elif op == "*" and value % 2 == 0:
+            lhs, rhs = value // 2, 2
+        else:
+            # also the fallback when + or * cannot split the value
+            op = "/"
+            b = rng.randint(1, 5)
+            lhs, rhs = value * b, b
+        jobs[name] = f"{left} {op} {right}"
+        queue.append((left, lhs, in_divisor))
+        queue.append((right, rhs, in_divisor or op == "/"))
+
+    humn = rng.choice(candidates)
+    jobs["humn"] = jobs.pop(humn)
+    for name, job in jobs.items():
+        jobs[name] = " ".join("humn" if part == humn else part for part in job.split())
+    lines = [f"{name}: {job}" for name, job in jobs.items()]
+    rng.shuffle(lines)
+    return "\n".join(lines) + "\n"
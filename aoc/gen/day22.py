@@ -0,0 +1,45 @@
+import random
+from collections import defaultdict
+
+SIZES = (10, 50, 200)
+
+
+def generate(n, seed=0, n_instructions=None, wall_density=0.1):
+    """monkey map of cube side n in the usual input layout, followed by the path
+
+     12
+     3
+    45
+    6
+    """
+    rng = random.Random(seed)
+    n_instructions = n_instructions or 4 * n
+    faces = [(0, 1), (0, 2), (1, 1), (2, 0), (2, 1), (3, 0)]
+
+    tiles = dict()
+    for fr, fc in faces:
+        for r in range(fr * n, (fr + 1) * n):
+            for c in range(fc * n, (fc + 1) * n):
+                tiles[r, c] = "#" if rng.random() < wall_density else "."
+    # the starting tile has to be open
+    tiles[0, n] = "."
+    # the solver expects a wall in every row and column of the map
+    for axis in (0, 1):
+        lines = defaultdict(list)
+        for position in tiles:
+            if position != (0, n):
+                lines[position[axis]].append(position)
+        for positions in lines.values():
+            if all(tiles[p] == "." for p in positions):
+                tiles[rng.choice(positions)] = "#"
+
+    rows = []
+    for r in range(4 * n):
+        cols = [fc * n + i for fr, fc in faces if fr == r // n for i in range(n)]
+        rows.append(" " * cols[0] + "".join(tiles[r, c] for c in cols))
+
+    path = [str(rng.randint(1, 2 * n))]
+    for _ in range(n_instructions):
+        path.append(rng.choice("LR"))
+        path.append(str(rng.randint(1, 2 * n)))
+    return "\n".join(rows) + "\n\n" + "".join(path) + "\n"
@@ -0,0 +1,12 @@
+import random
+
+SIZES = (10, 20, 40, 80)
+
+
+def generate(n, seed=0, density=0.4):
+    """n x n scan with elves on about density of the tiles"""
+    rng = random.Random(seed)
+    return "".join(
+        "".join("#" if rng.random() < density else "." for _ in range(n)) + "\n"
+        for _ in range(n)
+    )
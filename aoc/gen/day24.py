@@ -0,0 +1,27 @@
+import random
+
+SIZES = (8, 16, 32)
+
+
+def generate(n, seed=0, height=None, density=0.4):
+    """valley with n x height inner tiles, blizzards on about density of them
+
+    Like the puzzle inputs, no vertical blizzards start in the entrance or exit
+    columns so they never leave the valley.
+    """
+    rng = random.Random(seed)
+    height = height or max(n // 3, 2)
+    width = n + 2
+    lines = ["#." + "#" * n]
+    for _ in range(height):
+        row = []
+        for c in range(1, width - 1):
+            if rng.random() >= density:
+                row.append(".")
+            elif c in (1, width - 2):
+                row.append(rng.choice("<>"))
+            else:
+                row.append(rng.choice("<>^v"))
+        lines.append("#" + "".join(row) + "#")
+    lines.append("#" * n + ".#")
+    return "\n".join(lines) + "\n"
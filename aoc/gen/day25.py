@@ -0,0 +1,20 @@
+import random
+
+SIZES = (10**3, 10**4, 10**5)
+
+DIGITS = {0: "0", 1: "1", 2: "2", 3: "=", 4: "-"}
+
+
+def to_snafu(decimal):
+    snafu = ""
+    while decimal > 0:
+        modulo = decimal % 5
+        snafu = DIGITS[modulo] + snafu
+        decimal = (decimal + 2) // 5
+    return snafu
+
+
+def generate(n, seed=0, max_value=10**12):
+    """n SNAFU numbers"""
+    rng = random.Random(seed)
+    return "".join(f"{to_snafu(rng.randint(1, max_value))}\n" for _ in range(n))
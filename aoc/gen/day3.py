@@ -0,0 +1,39 @@
+import random
+import string
+
+SIZES = (3 * 10**3, 3 * 10**4, 3 * 10**5)
+
+ITEMS = string.ascii_lowercase + string.ascii_uppercase
+
+
+def rucksack(rng, pool, badge, length):
+    """Compartments share exactly one item, the badge is the only item shared with
+    the other rucksacks of the group since every rucksack draws from its own pool."""
+    shared = rng.choice(pool + [badge])
+    rest = [item for item in pool if item != shared]
+    rng.shuffle(rest)
+    left_pool, right_pool = rest[: len(rest) // 2], rest[len(rest) // 2 :]
+    if badge != shared:
+        left_pool = left_pool + [badge]
+    left = [shared] + rng.choices(left_pool, k=length - 1)
+    right = [shared] + rng.choices(right_pool, k=length - 1)
+    if badge != shared and badge not in left:
+        left[-1] = badge
+    rng.shuffle(left)
+    rng.shuffle(right)
+    return "".join(left + right)
+
+
+def generate(n, seed=0, group_size=3):
+    """n rucksacks (rounded up to whole groups) with 8 to 24 items per compartment"""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(-(-n // group_size)):
+        items = list(ITEMS)
+        rng.shuffle(items)
+        badge, others = items[0], items[1:]
+        pool_size = len(others) // group_size
+        for i in range(group_size):
+            pool = others[i * pool_size : (i + 1) * pool_size]
+            lines.append(rucksack(rng, pool, badge, rng.randint(8, 24)))
+    return "\n".join(lines)
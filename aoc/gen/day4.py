@@ -0,0 +1,10 @@
+import numpy as np
+
+SIZES = (10**4, 10**5, 10**6)
+
+
+def generate(n, seed=0, max_section=99):
+    """n pairs of section assignments"""
+    rng = np.random.default_rng(seed)
+    sections = np.sort(rng.integers(1, max_section + 1, (n, 2, 2)), axis=2).tolist()
+    return "\n".join(f"{a}-{b},{c}-{d}" for (a, b), (c, d) in sections)
@@ -0,0 +1,33 @@
+import random
+import string
+
+SIZES = (10**3, 10**4, 10**5, 10**6)
+
+
+def generate(n, seed=0, n_stacks=9, height=None):
+    """n moves on n_stacks stacks, every stack keeps at least one crate"""
+    rng = random.Random(seed)
+    height = height or max(8, n // 10)
+    stacks = [
+        [rng.choice(string.ascii_uppercase) for _ in range(rng.randint(1, height))]
+        for _ in range(n_stacks)
+    ]
+
+    drawing = []
+    for level in range(max(map(len, stacks)) - 1, -1, -1):
+        row = " ".join(f"[{s[level]}]" if level < len(s) else "   " for s in stacks)
+        drawing.append(row.rstrip())
+    drawing.append(" ".join(f" {i + 1} " for i in range(n_stacks)).rstrip())
+
+    sizes = [len(s) for s in stacks]
+    moves = []
+    for _ in range(n):
+        candidates = [i for i, size in enumerate(sizes) if size > 1]
+        from_stack = rng.choice(candidates)
+        to_stack = rng.choice([i for i in range(n_stacks) if i != from_stack])
+        amount = rng.randint(1, sizes[from_stack] - 1)
+        sizes[from_stack] -= amount
+        sizes[to_stack] += amount
+        moves.append(f"move {amount} from {from_stack + 1} to {to_stack + 1}")
+
+    return "\n".join(drawing) + "\n\n" + "\n".join(moves)
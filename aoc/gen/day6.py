@@ -0,0 +1,18 @@
+import random
+import string
+
+SIZES = (10**4, 10**5, 10**6, 10**7)
+
+
+def generate(n, seed=0):
+    """datastream of n characters whose first 14-character marker is at the very end
+
+    The bulk is drawn from only 3 letters so no 4-character marker appears before
+    the tail either.
+    """
+    rng = random.Random(seed)
+    letters = list(string.ascii_lowercase)
+    rng.shuffle(letters)
+    tail = letters[:14]
+    body = rng.choices(letters[14:17], k=max(0, n - len(tail)))
+    return "".join(body + tail)
@@ -0,0 +1,37 @@
+import random
+
+SIZES = (10**3, 10**4, 10**5)
+
+
+def generate(n, seed=0, files_per_dir=4, total_size=50000000):
+    """terminal session browsing a tree of n directories
+
+    File sizes are scaled so the disk holds about total_size, more than the 40M
+    that leave room for the update in part 2.
+    """
+    rng = random.Random(seed)
+    max_file_size = max(4 * total_size // (n * files_per_dir), 1)
+    children = {0: []}
+    for d in range(1, n):
+        parent = rng.randrange(d)
+        children[parent].append(d)
+        children[d] = []
+
+    lines = ["$ cd /"]
+
+    def visit(d):
+        lines.append("$ ls")
+        for child in children[d]:
+            lines.append(f"dir d{child}")
+        for i in range(rng.randint(0, files_per_dir)):
+            lines.append(
+                f"{rng.randint(1, max_file_size)} f{i}.{rng.choice(['txt', 'dat'])}"
+            )
+        for child in children[d]:
+            lines.append(f"$ cd d{child}")
+            visit(child)
+            lines.append("$ cd ..")
+
+    # random recursive trees are only O(log n) deep
+    visit(0)
+    return "\n".join(lines)
@@ -0,0 +1,9 @@
+import random
+
+SIZES = (100, 1000, 5000)
+
+
+def generate(n, seed=0):
+    """n x n forest of tree heights"""
+    rng = random.Random(seed)
+    return "\n".join("".join(rng.choices("0123456789", k=n)) for _ in range(n))
@@ -0,0 +1,11 @@
+import random
+
+SIZES = (10**3, 10**4, 10**5)
+
+
+def generate(n, seed=0, max_steps=20):
+    """n rope motions of 1 to max_steps steps"""
+    rng = random.Random(seed)
+    return "\n".join(
+        f"{rng.choice('RLUD')} {rng.randint(1, max_steps)}" for _ in range(n)
+    )
@@ -0,0 +1,430 @@
+"""Command line runner that times the daily solvers in a uniform way.
+
+    python -m aoc run 1-25 --input tests --repeat 3
+    python -m aoc run 15 --input input --set 15.y=2000000 --set 15.max_pos=4000000
+    python -m aoc run 1-14 --format json --output baseline.json
+    python -m aoc run 1-14 --baseline baseline.json --tolerance 0.5
+    python -m aoc bench 1-9 --sizes 1000,10000,100000 --max-exponent 1.3
+
+Every day module exposes ``solve_part1(fp)`` and (optionally) ``solve_part2(fp)``.
+Each part runs in a fresh worker process, so the reported peak RSS belongs to that
+solver alone. Anything the solvers print (or tqdm progress bars) is discarded.
+
+``bench`` feeds the solvers inputs of growing size from ``aoc.gen`` and reports the
+empirical scaling exponent between consecutive sizes, log(t2 / t1) / log(n2 / n1).
+"""
+
+import argparse
+import ast
+import contextlib
+import importlib
+import inspect
+import json
+import math
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from aoc import gen
+
+PARTS = {1: "solve_part1", 2: "solve_part2"}
+N_DAYS = 25
+# timings below this are too noisy to compare or derive a scaling exponent from
+MIN_RELIABLE_TIME = 0.01
+
+
+def parse_days(spec):
+    """'1-5,8,10-12' -> [1, 2, 3, 4, 5, 8, 10, 11, 12]"""
+    days = set()
+    for chunk in spec.split(","):
+        if "-" in chunk:
+            first, last = chunk.split("-")
+            days.update(range(int(first), int(last) + 1))
+        elif chunk:
+            days.add(int(chunk))
+    return sorted(days)
+
+
+def parse_params(assignments):
+    """['15.y=2000000', '17.N=5000'] -> {15: {'y': 2000000}, 17: {'N': 5000}}"""
+    params = dict()
+    for assignment in assignments or []:
+        key, value = assignment.split("=", 1)
+        day, name = key.split(".", 1)
+        try:
+            value = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            pass
+        params.setdefault(int(day), dict())[name] = value
+    return params
+
+
+def find_solvers(day):
+    module = importlib.import_module(f"aoc.day{day}")
+    return {
+        part: getattr(module, name)
+        for part, name in PARTS.items()
+        if hasattr(module, name)
+    }
+
+
+def accepted_kwargs(solver, params):
+    accepted = inspect.signature(solver).parameters
+    return {k: v for k, v in params.items() if k in accepted}
+
+
+def to_jsonable(result):
+    if isinstance(result, np.generic):
+        return result.item()
+    if result is None or isinstance(result, (bool, int, float, str)):
+        return result
+    return str(result)
+
+
+def peak_rss():
+    """Peak resident set size of the current process in bytes.
+
+    ru_maxrss survives exec, so a spawned worker would report the size of the
+    process that forked it. The per address space VmHWM is used where available.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux reports kilobytes, macOS bytes
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def measure(solver, fp, repeat=1, **kwargs):
+    timings = []
+    result = None
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(
+        devnull
+    ), contextlib.redirect_stderr(devnull):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = solver(fp, **kwargs)
+            timings.append(time.perf_counter() - start)
+    return dict(
+        result=to_jsonable(result),
+        best=min(timings),
+        mean=sum(timings) / len(timings),
+        peak_rss=peak_rss(),
+    )
+
+
+def time_part(day, part, fp, repeat=1, params=None):
+    """Entry point of the worker process: import, run and measure one part.
+
+    The solver runs from a scratch directory, so the debug files some days dump
+    (df_simulation.csv, path.txt) do not end up in the working tree.
+    """
+    fp = os.path.abspath(fp)
+    solver = find_solvers(day)[part]
+    kwargs = accepted_kwargs(solver, params or dict())
+    with tempfile.TemporaryDirectory(prefix="aoc-run-") as scratch:
+        os.chdir(scratch)
+        return measure(solver, fp, repeat, **kwargs)
+
+
+def worker(connection, func, args):
+    try:
+        connection.send((True, func(*args)))
+    except Exception as e:
+        connection.send((False, f"{type(e).__name__}: {e}"))
+    finally:
+        connection.close()
+
+
+def run_isolated(func, *args, timeout=None):
+    """Runs func(*args) in a fresh process that is killed after timeout seconds.
+
+    Failures are raised as RuntimeError with a 'ExceptionType: message' text.
+    """
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=worker, args=(sender, func, args))
+    process.start()
+    sender.close()
+    try:
+        if not receiver.poll(timeout):
+            raise RuntimeError(f"TimeoutError: no result after {timeout}s")
+        success, outcome = receiver.recv()
+    except EOFError:
+        process.join()
+        raise RuntimeError(f"worker exited with code {process.exitcode}")
+    finally:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+        receiver.close()
+    if not success:
+        raise RuntimeError(outcome)
+    return outcome
+
+
+def run_day(day, input_dir, repeat=1, params=None, timeout=None):
+    rows = []
+    fp = os.path.join(input_dir, f"{day}.txt")
+    try:
+        solvers = find_solvers(day)
+    except ImportError as e:
+        return [dict(day=day, part=None, error=f"cannot import: {e}")]
+    if not solvers:
+        return [dict(day=day, part=None, error="no solve_part functions")]
+    if not os.path.exists(fp):
+        return [dict(day=day, part=None, error=f"missing input {fp}")]
+
+    for part in solvers:
+        row = dict(day=day, part=part, input=fp)
+        try:
+            row.update(
+                run_isolated(time_part, day, part, fp, repeat, params, timeout=timeout)
+            )
+        except RuntimeError as e:
+            row["error"] = str(e)
+        rows.append(row)
+    return rows
+
+
+def compare_to_baseline(rows, baseline, tolerance=0.25):
+    """Returns a list of human readable regressions against a previous json report."""
+    previous = {(row["day"], row["part"]): row for row in baseline}
+    regressions = []
+    for row in rows:
+        old = previous.get((row["day"], row["part"]))
+        if old is None or "error" in old:
+            continue
+        if "error" in row:
+            regressions.append(f"day {row['day']} part {row['part']}: {row['error']}")
+            continue
+        if row["result"] != old["result"]:
+            regressions.append(
+                f"day {row['day']} part {row['part']}: "
+                f"result {row['result']!r} != baseline {old['result']!r}"
+            )
+        if row["best"] > max(old["best"], MIN_RELIABLE_TIME) * (1 + tolerance):
+            regressions.append(
+                f"day {row['day']} part {row['part']}: "
+                f"{row['best']:.4f}s > baseline {old['best']:.4f}s (+{tolerance:.0%})"
+            )
+    return regressions
+
+
+def format_table(rows):
+    header = f"{'day':>4} {'part':>4}  {'result':<24} {'best (s)':>10} {'mean (s)':>10} {'peak RSS (MiB)':>15}"
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        part = row["part"] if row["part"] is not None else "-"
+        if "error" in row:
+            lines.append(f"{row['day']:>4} {part:>4}  error: {row['error']}")
+            continue
+        result = repr(row["result"])
+        result = result if len(result) <= 24 else result[:21] + "..."
+        lines.append(
+            f"{row['day']:>4} {part:>4}  {result:<24} {row['best']:>10.4f} "
+            f"{row['mean']:>10.4f} {row['peak_rss'] / 2**20:>15.1f}"
+        )
+    return "\n".join(lines)
+
+
+def run(args):
+    params = parse_params(args.set)
+    rows = []
+    for day in parse_days(args.days):
+        rows.extend(
+            run_day(day, args.input, args.repeat, params.get(day), args.timeout)
+        )
+
+    report = json.dumps(rows, indent=2) if args.format == "json" else format_table(rows)
+    print(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(rows, f, indent=2)
+
+    if args.baseline:
+        regressions = compare_to_baseline(
+            rows, json.load(open(args.baseline)), args.tolerance
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+def parse_sizes(spec):
+    return [int(float(size)) for size in spec.split(",")] if spec else None
+
+
+def scaling_exponent(previous, row):
+    if previous is None or min(previous["best"], row["best"]) < MIN_RELIABLE_TIME:
+        return None
+    return math.log(row["best"] / previous["best"]) / math.log(
+        row["size"] / previous["size"]
+    )
+
+
+def bench_day(
+    day, sizes=None, seed=0, repeat=1, params=None, budget=None, timeout=None
+):
+    try:
+        solvers = find_solvers(day)
+        sizes = sizes or gen.default_sizes(day)
+        params = {**gen.solver_params(day), **(params or dict())}
+    except ImportError as e:
+        return [dict(day=day, part=None, size=None, error=f"cannot import: {e}")]
+
+    rows = []
+    for part in solvers:
+        previous = None
+        for size in sizes:
+            row = dict(day=day, part=part, size=size)
+            with tempfile.TemporaryDirectory(prefix="aoc-bench-") as directory:
+                fp = gen.write_input(day, size, directory, seed=seed)
+                try:
+                    row.update(
+                        run_isolated(
+                            time_part, day, part, fp, repeat, params, timeout=timeout
+                        )
+                    )
+                except RuntimeError as e:
+                    row["error"] = str(e)
+            rows.append(row)
+            if "error" in row:
+                break
+            row["exponent"] = scaling_exponent(previous, row)
+            previous = row
+            if budget is not None and row["best"] > budget:
+                # larger sizes would only take longer
+                break
+    return rows
+
+
+def format_scaling_table(rows):
+    header = (
+        f"{'day':>4} {'part':>4} {'size':>10}  {'result':<24} {'best (s)':>10} "
+        f"{'peak RSS (MiB)':>15} {'exponent':>9}"
+    )
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        part = row["part"] if row["part"] is not None else "-"
+        size = row["size"] if row["size"] is not None else "-"
+        if "error" in row:
+            lines.append(f"{row['day']:>4} {part:>4} {size:>10}  error: {row['error']}")
+            continue
+        result = repr(row["result"])
+        result = result if len(result) <= 24 else result[:21] + "..."
+        exponent = "" if row["exponent"] is None else f"{row['exponent']:.2f}"
+        lines.append(
+            f"{row['day']:>4} {part:>4} {size:>10}  {result:<24} {row['best']:>10.4f} "
+            f"{row['peak_rss'] / 2**20:>15.1f} {exponent:>9}"
+        )
+    return "\n".join(lines)
+
+
+def bench(args):
+    params = parse_params(args.set)
+    rows = []
+    for day in parse_days(args.days):
+        rows.extend(
+            bench_day(
+                day,
+                parse_sizes(args.sizes),
+                args.seed,
+                args.repeat,
+                params.get(day),
+                args.budget,
+                args.timeout,
+            )
+        )
+
+    if args.format == "json":
+        print(json.dumps(rows, indent=2))
+    else:
+        print(format_scaling_table(rows))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(rows, f, indent=2)
+
+    if args.max_exponent is not None:
+        blowups = [
+            row
+            for row in rows
+            if row.get("exponent") is not None and row["exponent"] > args.max_exponent
+        ]
+        for row in blowups:
+            print(
+                f"SUPER-LINEAR day {row['day']} part {row['part']}: exponent "
+                f"{row['exponent']:.2f} at size {row['size']}",
+                file=sys.stderr,
+            )
+        return 1 if blowups else 0
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m aoc")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run and time the daily solvers")
+    run_parser.add_argument("days", nargs="?", default=f"1-{N_DAYS}")
+    run_parser.add_argument("--input", default="tests", help="directory with <day>.txt")
+    run_parser.add_argument("--repeat", type=int, default=1)
+    run_parser.add_argument(
+        "--set",
+        action="append",
+        metavar="DAY.NAME=VALUE",
+        help="keyword argument for a day's solvers, e.g. 15.y=2000000",
+    )
+    run_parser.add_argument(
+        "--timeout", type=float, help="kill a part after this many seconds"
+    )
+    run_parser.add_argument("--format", choices=["table", "json"], default="table")
+    run_parser.add_argument("--output", help="also write the json report to this file")
+    run_parser.add_argument("--baseline", help="json report to check for regressions")
+    run_parser.add_argument("--tolerance", type=float, default=0.25)
+    run_parser.set_defaults(func=run)
+
+    bench_parser = subparsers.add_parser(
+        "bench", help="time the solvers on generated inputs of growing size"
+    )
+    bench_parser.add_argument("days", nargs="?", default=f"1-{N_DAYS}")
+    bench_parser.add_argument(
+        "--sizes", help="comma separated sizes, defaults to aoc.gen.day<N>.SIZES"
+    )
+    bench_parser.add_argument("--seed", type=int, default=0)
+    bench_parser.add_argument("--repeat", type=int, default=1)
+    bench_parser.add_argument("--set", action="append", metavar="DAY.NAME=VALUE")
+    bench_parser.add_argument(
+        "--budget",
+        type=float,
+        help="skip larger sizes of a part once it takes longer than this (s)",
+    )
+    bench_parser.add_argument(
+        "--timeout", type=float, help="kill a part after this many seconds"
+    )
+    bench_parser.add_argument(
+        "--max-exponent",
+        type=float,
+        help="fail when a scaling exponent exceeds this, e.g. 1.3",
+    )
+    bench_parser.add_argument("--format", choices=["table", "json"], default="table")
+    bench_parser.add_argument(
+        "--output", help="also write the json report to this file"
+    )
+    bench_parser.set_defaults(func=bench)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)